@@ -17,9 +17,12 @@ depends_on = None
 
 
 def upgrade() -> None:
-    op.add_column("tasks", sa.Column("report_language", sa.String(length=10), nullable=True))
-    op.execute("UPDATE tasks SET report_language = 'auto' WHERE report_language IS NULL")
-    op.alter_column("tasks", "report_language", nullable=False)
+    # 常量默认值在 PostgreSQL 11+ 上只改元数据，无需全表 UPDATE
+    op.add_column(
+        "tasks",
+        sa.Column("report_language", sa.String(length=10), nullable=False, server_default="auto"),
+    )
+    op.alter_column("tasks", "report_language", server_default=None)
 
 
 def downgrade() -> None:
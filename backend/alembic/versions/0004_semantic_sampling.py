@@ -15,15 +15,48 @@ down_revision = "0003_sub_task_link"
 branch_labels = None
 depends_on = None
 
+BACKFILL_BATCH_SIZE = 30000
 
-def upgrade() -> None:
-    op.add_column("tasks", sa.Column("semantic_sampling", sa.Boolean(), nullable=True))
-    op.execute("UPDATE tasks SET semantic_sampling = FALSE WHERE semantic_sampling IS NULL")
-    op.alter_column("tasks", "semantic_sampling", nullable=False)
 
-    op.add_column("subscriptions", sa.Column("semantic_sampling", sa.Boolean(), nullable=True))
-    op.execute("UPDATE subscriptions SET semantic_sampling = FALSE WHERE semantic_sampling IS NULL")
-    op.alter_column("subscriptions", "semantic_sampling", nullable=False)
+def _supports_fast_default() -> bool:
+    """PostgreSQL 11+ 添加常量默认值只改元数据"""
+    if op.get_context().as_sql:
+        return True
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return True
+    version = bind.dialect.server_version_info or ()
+    return version >= (11,)
+
+
+def _add_flag_column(table: str) -> None:
+    op.add_column(
+        table,
+        sa.Column("semantic_sampling", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.alter_column(table, "semantic_sampling", server_default=None)
+
+
+def _add_flag_column_chunked(table: str) -> None:
+    """旧版本 PostgreSQL：分批回填，每批单独提交以缩短锁持有时间"""
+    op.add_column(table, sa.Column("semantic_sampling", sa.Boolean(), nullable=True))
+    statement = sa.text(
+        f"UPDATE {table} SET semantic_sampling = FALSE "
+        f"WHERE id IN (SELECT id FROM {table} WHERE semantic_sampling IS NULL LIMIT :limit)"
+    )
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(statement, {"limit": BACKFILL_BATCH_SIZE})
+            if not result.rowcount:
+                break
+    op.alter_column(table, "semantic_sampling", nullable=False)
+
+
+def upgrade() -> None:
+    add_column = _add_flag_column if _supports_fast_default() else _add_flag_column_chunked
+    add_column("tasks")
+    add_column("subscriptions")
 
 
 def downgrade() -> None:
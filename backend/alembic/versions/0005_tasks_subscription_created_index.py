@@ -0,0 +1,32 @@
+"""replace tasks.subscription_id index with (subscription_id, created_at DESC)
+
+Revision ID: 0005_tasks_sub_created_idx
+Revises: 0004_semantic_sampling
+Create Date: 2026-01-20 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_tasks_sub_created_idx"
+down_revision = "0004_semantic_sampling"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 复合索引的前缀列可以替代原单列索引；INCLUDE status 使订阅任务列表可走 index-only scan
+    op.create_index(
+        "ix_tasks_subscription_id_created",
+        "tasks",
+        ["subscription_id", sa.text("created_at DESC")],
+        postgresql_include=["status"],
+    )
+    op.drop_index("ix_tasks_subscription_id", table_name="tasks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tasks_subscription_id", "tasks", ["subscription_id"])
+    op.drop_index("ix_tasks_subscription_id_created", table_name="tasks")
@@ -0,0 +1,28 @@
+"""add (is_read, created_at DESC) index to alerts
+
+Revision ID: 0006_alerts_read_created_idx
+Revises: 0005_tasks_sub_created_idx
+Create Date: 2026-01-20 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_alerts_read_created_idx"
+down_revision = "0005_tasks_sub_created_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_alerts_is_read_created_at",
+        "alerts",
+        ["is_read", sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_alerts_is_read_created_at", table_name="alerts")
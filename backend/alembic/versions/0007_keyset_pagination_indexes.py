@@ -0,0 +1,33 @@
+"""add keyset pagination indexes to tasks and raw_data
+
+Revision ID: 0007_keyset_pagination_idx
+Revises: 0006_alerts_read_created_idx
+Create Date: 2026-01-21 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_keyset_pagination_idx"
+down_revision = "0006_alerts_read_created_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tasks_created_at_id",
+        "tasks",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    # (task_id, id) 的前缀列可以替代原 task_id 单列索引
+    op.create_index("ix_raw_data_task_id_id", "raw_data", ["task_id", "id"])
+    op.drop_index("ix_raw_data_task_id", table_name="raw_data")
+
+
+def downgrade() -> None:
+    op.create_index("ix_raw_data_task_id", "raw_data", ["task_id"])
+    op.drop_index("ix_raw_data_task_id_id", table_name="raw_data")
+    op.drop_index("ix_tasks_created_at_id", table_name="tasks")
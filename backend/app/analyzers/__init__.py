@@ -1,5 +1,5 @@
 """AI分析模块"""
-from app.analyzers.llm_client import LLMClient
+from app.analyzers.llm_client import LLMClient, get_llm_client
 from app.analyzers.preprocessor import DataPreprocessor
 from app.analyzers.sentiment import SentimentAnalyzer
 from app.analyzers.clustering import ClusteringAnalyzer
@@ -7,6 +7,7 @@ from app.analyzers.mermaid import MermaidGenerator
 
 __all__ = [
     "LLMClient",
+    "get_llm_client",
     "DataPreprocessor",
     "SentimentAnalyzer",
     "ClusteringAnalyzer",
@@ -1,8 +1,10 @@
 """观点聚类和摘要生成"""
 import re
-from typing import List, Dict, Any
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 
-from app.analyzers.llm_client import LLMClient
+from app.analyzers.llm_client import get_llm_client
 from app.analyzers.llm_validators import validate_clustering_response
 from app.config import get_settings
 from prompts.analysis_prompts import (
@@ -12,12 +14,21 @@ from prompts.analysis_prompts import (
     build_clustering_repair_prompt,
 )
 
+_SENTENCE_SPLIT_RE = re.compile(r"[。.!?;；，,、]+")
+
+
+def _clean_str(value: Any) -> str:
+    """字段转为去首尾空白的字符串，None 视为空串"""
+    if isinstance(value, str):
+        return value.strip()
+    return "" if value is None else str(value).strip()
+
 
 class ClusteringAnalyzer:
     """观点聚类和摘要生成器"""
 
     def __init__(self):
-        self.llm = LLMClient()
+        self.llm = get_llm_client()
 
     def _normalize_key_opinions(self, key_opinions: Any) -> List[Dict[str, Any]]:
         normalized: List[Dict[str, Any]] = []
@@ -25,25 +36,25 @@ class ClusteringAnalyzer:
             key_opinions = [key_opinions]
         if not isinstance(key_opinions, list):
             return normalized
+        normalize_points = self._normalize_points
+        append = normalized.append
         for item in key_opinions:
             if isinstance(item, dict):
-                title = str(item.get("title", "")).strip()
-                description = str(item.get("description", "")).strip()
-                points = item.get("points", [])
-                points = self._normalize_points(points, description)
+                title = _clean_str(item.get("title"))
+                description = _clean_str(item.get("description"))
                 if title or description:
-                    normalized.append({
+                    append({
                         "title": title or "观点",
-                        "description": description or "",
-                        "points": points,
+                        "description": description,
+                        "points": normalize_points(item.get("points", []), description),
                     })
             elif isinstance(item, str):
                 text = item.strip()
                 if text:
-                    normalized.append({
+                    append({
                         "title": text,
                         "description": "",
-                        "points": self._normalize_points([], text),
+                        "points": normalize_points([], text),
                     })
         return normalized
 
@@ -62,7 +73,7 @@ class ClusteringAnalyzer:
     def _extract_points(self, text: str, max_points: int = 3) -> List[str]:
         if not isinstance(text, str):
             return []
-        parts = re.split(r"[。.!?;；，,、]+", text)
+        parts = _SENTENCE_SPLIT_RE.split(text)
         cleaned = [self._sanitize_point(p) for p in parts if p.strip()]
         cleaned = [p for p in cleaned if p]
         if cleaned:
@@ -88,16 +99,17 @@ class ClusteringAnalyzer:
         if not thresholds:
             return max(min_count, min(max_count, 3))
 
-        count = min_count
-        for threshold in thresholds:
-            if item_count <= threshold:
-                return min(count, max_count)
-            count += 1
-        return max_count
+        # 第一个 >= item_count 的阈值位置，即原线性扫描中 item_count <= threshold 命中的位置
+        position = bisect_left(thresholds, item_count)
+        if position == len(thresholds):
+            return max_count
+        return min(min_count + position, max_count)
 
-    def _parse_thresholds(self, raw: str) -> List[int]:
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _parse_thresholds(raw: str) -> Tuple[int, ...]:
         if not isinstance(raw, str):
-            return []
+            return ()
         parts = [p.strip() for p in raw.split(",") if p.strip()]
         values = []
         for part in parts:
@@ -107,7 +119,7 @@ class ClusteringAnalyzer:
                 continue
             if value > 0:
                 values.append(value)
-        return sorted(set(values))
+        return tuple(sorted(set(values)))
 
     async def analyze(
         self,
@@ -120,12 +132,16 @@ class ClusteringAnalyzer:
         if not report_language:
             report_language = "auto"
         all_phrases = []
+        positive_count = neutral_count = negative_count = 0
         for r in sentiment_results:
             all_phrases.extend(r.get("key_phrases", []))
-
-        positive_count = len([r for r in sentiment_results if r['score'] >= 60])
-        neutral_count = len([r for r in sentiment_results if 40 <= r['score'] < 60])
-        negative_count = len([r for r in sentiment_results if r['score'] < 40])
+            score = r['score']
+            if score >= 60:
+                positive_count += 1
+            elif score >= 40:
+                neutral_count += 1
+            else:
+                negative_count += 1
 
         target_count = self._determine_target_count(len(items_text))
         prompt = build_clustering_user_prompt(
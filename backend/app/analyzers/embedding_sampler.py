@@ -1,6 +1,7 @@
 """Semantic sampling with local embeddings."""
 from __future__ import annotations
 
+import logging
 import math
 from typing import List
 
@@ -10,15 +11,27 @@ from sklearn.cluster import KMeans
 
 from app.collectors.base import CollectedItem
 
+logger = logging.getLogger(__name__)
+
+# faiss 可选：安装后用它做 KMeans，否则回退到 sklearn
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
 
 class EmbeddingSampler:
     """Sample representative items with local embeddings."""
 
-    _model_cache: dict[str, SentenceTransformer] = {}
+    _model_cache: dict[tuple[str, str, str], SentenceTransformer] = {}
 
     def __init__(
         self,
         model_name: str,
+        backend: str = "torch",
+        model_file: str = "",
         max_items: int = 200,
         target_count: int = 50,
         k_min: int = 3,
@@ -27,9 +40,7 @@ class EmbeddingSampler:
         batch_size: int = 64,
         text_max_length: int = 400,
     ) -> None:
-        if model_name not in self._model_cache:
-            self._model_cache[model_name] = SentenceTransformer(model_name)
-        self.model = self._model_cache[model_name]
+        self.model = self._get_model(model_name, (backend or "torch").lower(), model_file or "")
         self.max_items = max(1, max_items)
         self.target_count = max(1, target_count)
         self.k_min = max(1, k_min)
@@ -38,6 +49,32 @@ class EmbeddingSampler:
         self.batch_size = max(1, batch_size)
         self.text_max_length = max(50, text_max_length)
 
+    @classmethod
+    def _get_model(cls, model_name: str, backend: str, model_file: str) -> SentenceTransformer:
+        key = (model_name, backend, model_file)
+        if key not in cls._model_cache:
+            cls._model_cache[key] = cls._load_model(model_name, backend, model_file)
+        return cls._model_cache[key]
+
+    @staticmethod
+    def _load_model(model_name: str, backend: str, model_file: str) -> SentenceTransformer:
+        if backend != "torch":
+            kwargs = {"backend": backend}
+            if model_file:
+                kwargs["model_kwargs"] = {"file_name": model_file}
+            try:
+                return SentenceTransformer(model_name, **kwargs)
+            except Exception as exc:
+                # backend 参数需要 sentence-transformers>=3.2 及 optimum/onnxruntime
+                logger.warning(
+                    "Embedding backend %s unavailable, falling back to torch: %s", backend, exc
+                )
+
+        model = SentenceTransformer(model_name)
+        if model.device.type == "cuda":
+            model.half()
+        return model
+
     def sample(self, items: List[CollectedItem]) -> List[CollectedItem]:
         if not items:
             return []
@@ -46,35 +83,58 @@ class EmbeddingSampler:
         target_count = min(self.target_count, len(candidates))
         if len(candidates) <= target_count:
             return candidates
+        # 可剔除的数量不足 k_min 时聚类没有意义，直接截取，省去 embedding 推理
+        if len(candidates) - target_count < self.k_min:
+            return candidates[:target_count]
+
+        # 文本完全相同的条目只保留第一条，避免重复编码
+        first_index: dict[str, int] = {}
+        for idx, item in enumerate(candidates):
+            first_index.setdefault(self._build_text(item), idx)
+        texts = list(first_index)
+        unique_indices = list(first_index.values())
+        if len(unique_indices) - target_count < self.k_min:
+            return [candidates[i] for i in unique_indices[:target_count]]
 
-        texts = [self._build_text(item) for item in candidates]
         embeddings = self._encode(texts)
-        if embeddings is None or len(embeddings) != len(candidates):
+        if embeddings is None or len(embeddings) != len(texts):
             return candidates[:target_count]
 
         selected_indices = self._cluster_and_select(embeddings, target_count)
         if not selected_indices:
             return candidates[:target_count]
 
-        selected_indices = sorted(selected_indices)
+        selected_indices = sorted(unique_indices[i] for i in selected_indices)
         return [candidates[i] for i in selected_indices]
 
     def _build_text(self, item: CollectedItem) -> str:
-        text = item.content or item.title or ""
-        text = " ".join(text.replace("\n", " ").replace("\r", " ").split())
-        if len(text) > self.text_max_length:
-            text = text[: self.text_max_length]
-        return text
+        text = item.display_text
+        # str.split() 无参数时已按 \n \r \t 等所有空白切分
+        return " ".join(text.split())[: self.text_max_length]
 
     def _encode(self, texts: List[str]) -> np.ndarray | None:
         if not texts:
             return None
-        return self.model.encode(
+        embeddings = self.model.encode(
             texts,
             batch_size=self.batch_size,
             show_progress_bar=False,
+            convert_to_numpy=True,
             normalize_embeddings=True,
         )
+        # 统一为连续 float32（GPU FP16 模型会返回 float16），聚类与距离计算全程保持 float32
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def _kmeans(self, embeddings: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        if FAISS_AVAILABLE:
+            kmeans = faiss.Kmeans(embeddings.shape[1], k, niter=20, seed=42, verbose=False)
+            kmeans.train(embeddings)
+            _, labels = kmeans.index.search(embeddings, 1)
+            return labels[:, 0], kmeans.centroids
+
+        kmeans = KMeans(n_clusters=k, n_init="auto", random_state=42)
+        labels = kmeans.fit_predict(embeddings)
+        return labels, kmeans.cluster_centers_
 
     def _cluster_and_select(self, embeddings: np.ndarray, target_count: int) -> List[int]:
         n = embeddings.shape[0]
@@ -86,60 +146,70 @@ class EmbeddingSampler:
         if k >= n:
             return list(range(target_count))
 
-        kmeans = KMeans(n_clusters=k, n_init="auto", random_state=42)
-        labels = kmeans.fit_predict(embeddings)
-        centers = kmeans.cluster_centers_
+        labels, centers = self._kmeans(embeddings, k)
         centers = centers / np.linalg.norm(centers, axis=1, keepdims=True)
-        distances = 1 - np.sum(embeddings * centers[labels], axis=1)
-
-        cluster_indices: dict[int, List[int]] = {}
-        for idx, label in enumerate(labels):
-            cluster_indices.setdefault(int(label), []).append(idx)
-
-        cluster_sizes = {k: len(v) for k, v in cluster_indices.items()}
-        desired = {
-            k: max(1, round(target_count * size / n))
-            for k, size in cluster_sizes.items()
-        }
-
-        total_desired = sum(desired.values())
-        if total_desired > target_count:
-            for k in sorted(desired, key=lambda x: cluster_sizes[x], reverse=True):
-                if total_desired <= target_count:
-                    break
-                if desired[k] > 1:
-                    desired[k] -= 1
-                    total_desired -= 1
-
-        selected = set()
-        for label, idxs in cluster_indices.items():
-            idxs_sorted = sorted(idxs, key=lambda i: distances[i])
-            take = min(desired.get(label, 1), len(idxs_sorted))
-            selected.update(idxs_sorted[:take])
-
-        outlier_count = int(target_count * self.outlier_ratio)
-        outlier_count = min(outlier_count, target_count)
-        outliers = []
-        if outlier_count > 0:
-            for idx in np.argsort(distances)[::-1]:
-                if idx not in selected:
-                    outliers.append(int(idx))
-                    if len(outliers) >= outlier_count:
-                        break
-            selected.update(outliers)
-
-        if len(selected) > target_count:
-            outlier_set = set(outliers)
-            candidates = [i for i in selected if i not in outlier_set]
-            candidates_sorted = sorted(candidates, key=lambda i: distances[i])
-            while len(selected) > target_count and candidates_sorted:
-                selected.remove(candidates_sorted.pop(0))
-
-        if len(selected) < target_count:
-            for idx in np.argsort(distances):
-                if idx not in selected:
-                    selected.add(int(idx))
-                    if len(selected) >= target_count:
-                        break
-
-        return list(selected)[:target_count]
+        # 一次 (n, k) 矩阵乘，避免 centers[labels] 产生 (n, D) 临时数组
+        similarity = embeddings @ centers.T
+        distances = 1.0 - similarity[np.arange(n), labels]
+
+        return _select_indices(labels, distances, target_count, self.outlier_ratio).tolist()
+
+
+def _select_indices(
+    labels: np.ndarray,
+    distances: np.ndarray,
+    target_count: int,
+    outlier_ratio: float,
+) -> np.ndarray:
+    """按簇配额选取代表样本，并保留部分离群点"""
+    n = labels.shape[0]
+
+    # 按簇分组：稳定排序后每个簇是 order 中的一段连续区间
+    order = np.argsort(labels, kind="stable")
+    _, starts, sizes = np.unique(labels[order], return_index=True, return_counts=True)
+    desired = np.maximum(1, np.rint(target_count * sizes / n).astype(np.int64))
+
+    total_desired = int(desired.sum())
+    if total_desired > target_count:
+        # 大簇优先削减，同样大小时按簇首次出现的位置
+        for pos in np.lexsort((order[starts], -sizes)):
+            if total_desired <= target_count:
+                break
+            if desired[pos] > 1:
+                desired[pos] -= 1
+                total_desired -= 1
+
+    selected = np.zeros(n, dtype=bool)
+    for start, size, take in zip(starts, sizes, desired):
+        members = order[start:start + size]
+        take = min(int(take), int(size))
+        if take < size:
+            members = members[np.argpartition(distances[members], take - 1)[:take]]
+        selected[members] = True
+
+    outlier_count = int(target_count * outlier_ratio)
+    outlier_count = min(outlier_count, target_count)
+    is_outlier = np.zeros(n, dtype=bool)
+    if outlier_count > 0:
+        remaining = np.flatnonzero(~selected)
+        take = min(outlier_count, remaining.size)
+        if take > 0:
+            farthest = np.argpartition(-distances[remaining], take - 1)[:take]
+            is_outlier[remaining[farthest]] = True
+            selected |= is_outlier
+
+    excess = int(selected.sum()) - target_count
+    if excess > 0:
+        removable = np.flatnonzero(selected & ~is_outlier)
+        removable = removable[np.argsort(distances[removable], kind="stable")]
+        selected[removable[:excess]] = False
+
+    missing = target_count - int(selected.sum())
+    if missing > 0:
+        remaining = np.flatnonzero(~selected)
+        take = min(missing, remaining.size)
+        if take > 0:
+            closest = np.argpartition(distances[remaining], take - 1)[:take]
+            selected[remaining[closest]] = True
+
+    return np.flatnonzero(selected)[:target_count]
@@ -0,0 +1,230 @@
+"""LLM响应缓存"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+import orjson
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "llm:cache:"
+# Redis 连接失败后暂停访问的秒数，避免故障期间每个 key 都等一次超时
+REDIS_DOWN_COOLDOWN_S = 30.0
+
+
+class CacheBackend(Protocol):
+    """缓存后端协议；blocking 为 True 的后端在线程中调用，避免阻塞事件循环"""
+
+    blocking: bool
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        ...
+
+    def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        ...
+
+
+class MemoryBackend:
+    """进程内 LRU 缓存（带 TTL）"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        return [self.get(key) for key in keys]
+
+    def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+
+class RedisBackend:
+    """Redis 缓存，供多个 worker 进程共享"""
+
+    blocking = True
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(
+            url,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+        self._down_until = 0.0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, action: str, exc: Exception) -> None:
+        self._down_until = time.monotonic() + REDIS_DOWN_COOLDOWN_S
+        logger.debug("LLM cache redis %s failed, pausing %.0fs: %s", action, REDIS_DOWN_COOLDOWN_S, exc)
+
+    def get(self, key: str) -> Optional[str]:
+        if not self._available():
+            return None
+        try:
+            value = self._client.get(CACHE_KEY_PREFIX + key)
+        except Exception as exc:
+            self._mark_down("get", exc)
+            return None
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        if not self._available():
+            return
+        try:
+            self._client.set(CACHE_KEY_PREFIX + key, value, ex=ttl)
+        except Exception as exc:
+            self._mark_down("set", exc)
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys or not self._available():
+            return [None] * len(keys)
+        try:
+            values = self._client.mget([CACHE_KEY_PREFIX + key for key in keys])
+        except Exception as exc:
+            self._mark_down("mget", exc)
+            return [None] * len(keys)
+        return [value.decode("utf-8") if isinstance(value, bytes) else value for value in values]
+
+    def set_many(self, items: Dict[str, str], ttl: int) -> None:
+        if not items or not self._available():
+            return
+        try:
+            # 不需要事务，一次往返写入全部条目
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(CACHE_KEY_PREFIX + key, value, ex=ttl)
+            pipe.execute()
+        except Exception as exc:
+            self._mark_down("pipeline set", exc)
+
+
+class LLMCache:
+    """分层 LLM 响应缓存，按顺序查询各后端，命中后回填前面的层"""
+
+    def __init__(self, backends: List[CacheBackend], ttl: int = 86400):
+        self.backends = backends
+        self.ttl = max(1, ttl)
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    async def _call(backend: CacheBackend, method: str, *args: Any) -> Any:
+        func = getattr(backend, method)
+        if backend.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        for idx, backend in enumerate(self.backends):
+            raw = await self._call(backend, "get", key)
+            if raw is None:
+                continue
+            try:
+                data = orjson.loads(raw)
+            except ValueError:
+                continue
+            for upper in self.backends[:idx]:
+                await self._call(upper, "set", key, raw, self.ttl)
+            return data
+        return None
+
+    async def set_json(self, key: str, data: Dict[str, Any]) -> None:
+        raw = orjson.dumps(data).decode("utf-8")
+        for backend in self.backends:
+            await self._call(backend, "set", key, raw, self.ttl)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """批量读取，每个后端只往返一次；命中的条目回填前面的层"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        missing = list(range(len(keys)))
+        for idx, backend in enumerate(self.backends):
+            if not missing:
+                break
+            raws = await self._call(backend, "get_many", [keys[pos] for pos in missing])
+            found: Dict[str, str] = {}
+            still_missing = []
+            for pos, raw in zip(missing, raws):
+                data = None
+                if raw is not None:
+                    try:
+                        data = orjson.loads(raw)
+                    except ValueError:
+                        pass
+                if data is None:
+                    still_missing.append(pos)
+                    continue
+                results[pos] = data
+                found[keys[pos]] = raw
+            if found:
+                for upper in self.backends[:idx]:
+                    await self._call(upper, "set_many", found, self.ttl)
+            missing = still_missing
+        return results
+
+    async def set_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        if not items:
+            return
+        raws = {key: orjson.dumps(data).decode("utf-8") for key, data in items.items()}
+        for backend in self.backends:
+            await self._call(backend, "set_many", raws, self.ttl)
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMCache]:
+    """获取 LLM 缓存单例，未开启时返回 None"""
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+
+    backends: List[CacheBackend] = [MemoryBackend(settings.llm_cache_max_entries)]
+    if settings.llm_cache_use_redis and settings.redis_url:
+        try:
+            backends.append(RedisBackend(settings.redis_url))
+        except Exception as exc:
+            logger.warning("LLM cache redis backend unavailable: %s", exc)
+    return LLMCache(backends, ttl=settings.llm_cache_ttl_seconds)
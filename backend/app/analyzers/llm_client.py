@@ -1,10 +1,18 @@
 """LLM客户端封装"""
 import asyncio
-import json
+import weakref
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Callable, Tuple
 
+import httpx
+import orjson
+from app.analyzers.llm_cache import LLMCache, get_llm_cache
 from app.config import get_settings
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+
+class _LeaderCancelled(Exception):
+    """合并请求的发起者被取消；跟随者收到后自行重试，不跟着取消"""
 
 
 class LLMClient:
@@ -15,20 +23,61 @@ class LLMClient:
         self.api_key = settings.llm_api_key
         self.base_url = settings.llm_api_base_url
         self.model = settings.llm_model
+        self.prompt_cache_control = settings.llm_prompt_cache_control
         self.timeout = 60.0
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url or None,
-            timeout=self.timeout,
+        # 连接池绑定在事件循环上（Celery 每个任务新建 loop），按 loop 分别创建客户端
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # 进行中的相同请求合并为一次调用；Future 同样绑定在 loop 上
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
         )
+        self.cache = get_llm_cache()
 
-    def _chat_sync(self, payload: Dict[str, Any]) -> str:
-        response = self.client.chat.completions.create(**payload)
-        return response.choices[0].message.content or ""
+    def _get_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url or None,
+                timeout=self.timeout,
+                http_client=httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环上的客户端连接池（在关闭 loop 前调用）"""
+        loop = asyncio.get_running_loop()
+        self._inflight.pop(loop, None)
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    @staticmethod
+    def _mark_cacheable(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """为 system 消息加上 cache_control，供支持显式前缀缓存的服务端使用"""
+        marked = []
+        for message in messages:
+            content = message.get("content")
+            if message.get("role") == "system" and isinstance(content, str):
+                message = {
+                    **message,
+                    "content": [
+                        {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}
+                    ],
+                }
+            marked.append(message)
+        return marked
 
     def _safe_json_loads(self, raw: str) -> Tuple[Optional[Dict[str, Any]], str]:
         try:
-            return json.loads(raw), ""
+            return orjson.loads(raw), ""
         except Exception as exc:
             return None, f"JSON parse error: {type(exc).__name__}: {exc}"
 
@@ -39,6 +88,9 @@ class LLMClient:
         max_tokens: int = 2000,
         response_format: Optional[str] = None,
     ) -> str:
+        if self.prompt_cache_control:
+            messages = self._mark_cacheable(messages)
+
         payload = {
             "model": self.model,
             "messages": messages,
@@ -49,7 +101,38 @@ class LLMClient:
         if response_format == "json":
             payload["response_format"] = {"type": "json_object"}
 
-        return await asyncio.to_thread(self._chat_sync, payload)
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        key = LLMCache.make_key(**payload)
+        pending = inflight.get(key)
+        while pending is not None:
+            try:
+                # shield：跟随者被取消时不影响共享的请求
+                return await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # 发起者已退出，跟随新的发起者或由自己发起请求
+                pending = inflight.get(key)
+
+        future = loop.create_future()
+        inflight[key] = future
+        try:
+            response = await self._get_client().chat.completions.create(**payload)
+            content = response.choices[0].message.content or ""
+        except asyncio.CancelledError:
+            # 不能 cancel 共享的 future，否则所有跟随者都会被连带取消
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # 没有跟随者时避免 "exception was never retrieved" 日志
+            future.exception()
+            raise
+        else:
+            future.set_result(content)
+            return content
+        finally:
+            inflight.pop(key, None)
 
     async def analyze_json(
         self,
@@ -76,7 +159,21 @@ class LLMClient:
         validator: Callable[[Any], Tuple[bool, str]],
         temperature: float = 0.7,
         max_tokens: int = 2000,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
+        cache_key = None
+        if use_cache and self.cache is not None:
+            cache_key = LLMCache.make_key(
+                model=self.model,
+                system=system_prompt,
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            cached = await self.cache.get_json(cache_key)
+            if cached is not None and validator(cached)[0]:
+                return cached
+
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
@@ -91,6 +188,8 @@ class LLMClient:
         if data is not None:
             valid, verror = validator(data)
             if valid:
+                if cache_key:
+                    await self.cache.set_json(cache_key, data)
                 return data
             error = verror or error
 
@@ -111,4 +210,12 @@ class LLMClient:
         valid, verror = validator(repair_data)
         if not valid:
             raise ValueError(verror)
+        if cache_key:
+            await self.cache.set_json(cache_key, repair_data)
         return repair_data
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> LLMClient:
+    """获取共享的 LLM 客户端单例，复用连接池"""
+    return LLMClient()
@@ -1,6 +1,7 @@
 """Validation helpers for LLM outputs."""
-import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Tuple
+
+_SENTENCE_MARKERS = ".!?。！？"
 
 
 def validate_sentiment_response(data: Any, expected_count: int) -> Tuple[bool, str]:
@@ -67,8 +68,8 @@ def validate_clustering_response(
                     return False, f'Opinion {idx} has a non-string point.'
     if not isinstance(summary, str) or not summary.strip():
         return False, '"summary" must be a non-empty string.'
-    sentence_markers = re.findall(r"[.!?。！？]", summary)
-    if len(sentence_markers) < 3 and len(summary.strip()) < 180:
+    marker_count = sum(summary.count(marker) for marker in _SENTENCE_MARKERS)
+    if marker_count < 3 and len(summary.strip()) < 180:
         return False, '"summary" is too short; expected 4-6 sentences.'
     return True, ""
 
@@ -81,27 +82,30 @@ def validate_mermaid_output(code: str) -> Tuple[bool, str]:
         return False, "Mermaid output is empty."
     if lines[0].strip() != "mindmap":
         return False, 'First line must be "mindmap".'
-    root_lines = [line for line in lines if line.startswith("  ") and line.strip().startswith("root((")]
-    if len(root_lines) != 1:
-        return False, 'Expected exactly one root node "root((keyword))".'
+    root_count = sentiment_count = label_count = opinion_count = 0
+    for line in lines:
+        if not line.startswith("  "):
+            continue
+        label = line.lstrip()
+        is_root = label.startswith("root((")
+        if is_root:
+            root_count += 1
+        if not line.startswith("    "):
+            continue
+        if label == "Sentiment":
+            sentiment_count += 1
+        if line.startswith("      "):
+            if not is_root:
+                label_count += 1
+        elif label != "Sentiment":
+            opinion_count += 1
 
-    sentiment_lines = [line for line in lines if line.startswith("    ") and line.strip() == "Sentiment"]
-    if len(sentiment_lines) != 1:
+    if root_count != 1:
+        return False, 'Expected exactly one root node "root((keyword))".'
+    if sentiment_count != 1:
         return False, 'Expected a "Sentiment" branch under root.'
-
-    sentiment_label = [
-        line for line in lines
-        if line.startswith("      ") and not line.strip().startswith("root((")
-    ]
-    if not sentiment_label:
+    if not label_count:
         return False, 'Expected a sentiment label under "Sentiment".'
-
-    opinion_lines: List[str] = []
-    for line in lines:
-        if line.startswith("    ") and not line.startswith("      "):
-            label = line.strip()
-            if label != "Sentiment":
-                opinion_lines.append(label)
-    if len(opinion_lines) < 2:
+    if opinion_count < 2:
         return False, "Expected at least 2 opinion branches under root."
     return True, ""
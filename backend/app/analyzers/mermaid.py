@@ -2,7 +2,7 @@
 import re
 from typing import List, Dict, Any
 
-from app.analyzers.llm_client import LLMClient
+from app.analyzers.llm_client import get_llm_client
 from app.analyzers.llm_validators import validate_mermaid_output
 from prompts.analysis_prompts import (
     MERMAID_SYSTEM_PROMPT,
@@ -11,12 +11,23 @@ from prompts.analysis_prompts import (
     build_mermaid_repair_prompt,
 )
 
+_SPLIT_RE = re.compile(r"[。.!?;；，,、]+")
+# Mermaid 节点文本中会破坏语法的字符统一替换为空格
+_LABEL_TRANS = str.maketrans({ch: " " for ch in "\n\r\"'()[]{}:;|"})
+
+
+def _clean_str(value: Any) -> str:
+    """字段转为去首尾空白的字符串，None 视为空串"""
+    if isinstance(value, str):
+        return value.strip()
+    return "" if value is None else str(value).strip()
+
 
 class MermaidGenerator:
     """生成Mermaid格式的思维导图"""
 
     def __init__(self):
-        self.llm = LLMClient()
+        self.llm = get_llm_client()
 
     async def generate(
         self,
@@ -91,10 +102,7 @@ class MermaidGenerator:
     def _sanitize_label(self, label: str, max_len: int = 30) -> str:
         if not isinstance(label, str):
             return "Point"
-        cleaned = label.replace("\n", " ").replace("\r", " ").strip()
-        for ch in ['"', "'", "(", ")", "[", "]", "{", "}", ":", ";", "|"]:
-            cleaned = cleaned.replace(ch, " ")
-        cleaned = " ".join(cleaned.split())
+        cleaned = " ".join(label.translate(_LABEL_TRANS).split())
         if not cleaned:
             return "Point"
         return cleaned[:max_len]
@@ -102,32 +110,35 @@ class MermaidGenerator:
     def _normalize_key_opinions(self, key_opinions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if isinstance(key_opinions, list):
             normalized: List[Dict[str, Any]] = []
+            normalize_points = self._normalize_points
+            append = normalized.append
             for item in key_opinions:
                 if isinstance(item, dict):
-                    title = str(item.get("title", "")).strip()
-                    description = str(item.get("description", "")).strip()
-                    points = self._normalize_points(item.get("points", []), description)
+                    title = _clean_str(item.get("title"))
+                    description = _clean_str(item.get("description"))
                     if title or description:
-                        normalized.append({
+                        append({
                             "title": title or "观点",
-                            "description": description or "",
-                            "points": points,
+                            "description": description,
+                            "points": normalize_points(item.get("points", []), description),
                         })
                 elif isinstance(item, str):
                     text = item.strip()
                     if text:
-                        normalized.append({
+                        append({
                             "title": text,
                             "description": "",
-                            "points": self._normalize_points([], text),
+                            "points": normalize_points([], text),
                         })
             return normalized
-        if isinstance(key_opinions, str) and key_opinions.strip():
-            return [{
-                "title": key_opinions.strip(),
-                "description": "",
-                "points": self._normalize_points([], key_opinions.strip()),
-            }]
+        if isinstance(key_opinions, str):
+            text = key_opinions.strip()
+            if text:
+                return [{
+                    "title": text,
+                    "description": "",
+                    "points": self._normalize_points([], text),
+                }]
         return []
 
     def _extract_mermaid_code(self, response: str) -> str:
@@ -141,22 +152,20 @@ class MermaidGenerator:
         return response.strip()
 
     def _generate_fallback(self, keyword: str, key_opinions: List[Dict[str, Any]], sentiment_label: str) -> str:
-        safe_keyword = self._sanitize_label(keyword, max_len=40)
+        sanitize = self._sanitize_label
         lines = [
             "mindmap",
-            f"  root(({safe_keyword}))",
+            f"  root(({sanitize(keyword, max_len=40)}))",
             "    Sentiment",
-            f"      {self._sanitize_label(sentiment_label, max_len=20)}",
+            f"      {sanitize(sentiment_label, max_len=20)}",
         ]
+        append = lines.append
         for op in key_opinions[:6]:
-            title = op.get("title", "Point")
-            lines.append(f"    {self._sanitize_label(title, max_len=30)}")
-            points = op.get("points") or []
-            points = self._normalize_points(points, op.get("description", ""))
+            append("    " + sanitize(op.get("title", "Point"), max_len=30))
+            points = self._normalize_points(op.get("points") or [], op.get("description", ""))
             if points:
-                lines.append("      Points")
-                for point in points[:3]:
-                    lines.append(f"        {self._sanitize_label(point, max_len=30)}")
+                append("      Points")
+                lines.extend("        " + sanitize(point, max_len=30) for point in points[:3])
         return "\n".join(lines)
 
     def _normalize_points(self, points: Any, fallback_text: str) -> List[str]:
@@ -173,7 +182,7 @@ class MermaidGenerator:
     def _extract_points(self, text: str, max_points: int = 3) -> List[str]:
         if not isinstance(text, str):
             return []
-        parts = re.split(r"[。.!?;；，,、]+", text)
+        parts = _SPLIT_RE.split(text)
         cleaned = [self._sanitize_label(p, max_len=30) for p in parts if p.strip()]
         cleaned = [p for p in cleaned if p]
         if cleaned:
@@ -1,10 +1,53 @@
 """数据预处理器，过滤脏数据"""
+import heapq
+import logging
 import re
-from typing import List, Optional
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from langdetect import detect, LangDetectException
 
 from app.collectors.base import CollectedItem
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# fastText 可选：配置了 lid.176 模型路径时用它做语种识别，否则回退到 langdetect
+try:
+    import fasttext
+    FASTTEXT_AVAILABLE = True
+except ImportError:
+    fasttext = None
+    FASTTEXT_AVAILABLE = False
+
+# pyahocorasick 可选：广告词都是字面短语，用 Aho-Corasick 自动机一次线性扫描
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+
+@lru_cache(maxsize=2)
+def _load_language_model(path: str) -> Optional[Any]:
+    try:
+        return fasttext.load_model(path)
+    except Exception as exc:
+        logger.warning("Failed to load fastText language model %s: %s", path, exc)
+        return None
+
+
+@lru_cache(maxsize=2)
+def _build_ad_automaton(phrases: Tuple[str, ...]) -> Any:
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
 
 
 class DataPreprocessor:
@@ -15,8 +58,20 @@ class DataPreprocessor:
         r"subscribe\s+to", r"follow\s+me", r"check\s+out\s+my",
         r"promo\s*code", r"discount", r"free\s+shipping",
     ]
+    # 与 AD_PATTERNS 等价的字面短语，匹配小写且空白归一化后的文本
+    AD_PHRASES = (
+        "buy now", "click here", "limited offer",
+        "subscribe to", "follow me", "check out my",
+        "promo code", "promocode", "discount", "free shipping",
+    )
 
-    BOT_PATTERNS = [r"bot$", r"automoderator", r"^auto", r"_bot$"]
+    # 广告短语几乎都出现在开头，只扫描前 512 个字符
+    AD_SCAN_CHARS = 512
+
+    # 作者名规则只有前缀/后缀/子串三类，直接用字符串方法判断，无需正则
+    BOT_PREFIXES = ("auto",)
+    BOT_SUFFIXES = ("bot",)
+    BOT_KEYWORDS = ("automoderator",)
 
     def __init__(
         self,
@@ -33,7 +88,14 @@ class DataPreprocessor:
         self.filter_bots = filter_bots
 
         self.ad_regex = re.compile("|".join(self.AD_PATTERNS), re.IGNORECASE)
-        self.bot_regex = re.compile("|".join(self.BOT_PATTERNS), re.IGNORECASE)
+        self.ad_automaton = _build_ad_automaton(self.AD_PHRASES) if AHOCORASICK_AVAILABLE else None
+        # id(item) -> (item, score)；保留 item 引用避免 id 被复用
+        self._score_cache: Dict[int, Tuple[CollectedItem, float]] = {}
+
+        model_path = get_settings().language_detection_model_path
+        self.language_model = (
+            _load_language_model(model_path) if FASTTEXT_AVAILABLE and model_path else None
+        )
 
     def preprocess(self, items: List[CollectedItem]) -> List[CollectedItem]:
         result = []
@@ -48,40 +110,83 @@ class DataPreprocessor:
             seen_ids.add(item.source_id)
             result.append(item)
 
-        result.sort(key=self._get_engagement_score, reverse=True)
-        return result
+        scores = self._compute_scores(result)
+        # 稳定排序，等分条目保持原顺序，与 sort(reverse=True) 一致
+        order = np.argsort(-scores, kind="stable")
+        return [result[i] for i in order]
 
     def _is_valid(self, item: CollectedItem) -> bool:
-        text = item.content or item.title or ""
+        text = item.display_text
 
-        if len(text) < self.min_length or len(text) > self.max_length:
+        if not self.min_length <= len(text) <= self.max_length:
             return False
 
         if self.filter_bots and item.author:
-            if self.bot_regex.search(item.author):
+            if self._is_bot_author(item.author):
                 return False
 
-        if self.filter_ads and self.ad_regex.search(text):
+        if self.filter_ads and self._is_ad(text):
             return False
 
         if len(text) > 50:
-            try:
-                detected_lang = detect(text)
+            detected_lang = self._detect_language(text)
+            if detected_lang is not None:
                 if self.target_language == "en" and detected_lang not in ["en"]:
                     return False
                 if self.target_language == "zh" and detected_lang not in ["zh-cn", "zh-tw", "zh"]:
                     return False
-            except LangDetectException:
-                pass
 
         return True
 
+    def _detect_language(self, text: str) -> Optional[str]:
+        if self.language_model is not None:
+            try:
+                # fastText 按行预测，不接受换行符
+                labels, _ = self.language_model.predict(text.replace("\n", " "), k=1)
+            except Exception as exc:
+                # 如 fasttext 0.9.x 在 numpy 2 下 predict 抛 ValueError；停用模型，只记录一次
+                logger.warning("fastText language detection failed, falling back to langdetect: %s", exc)
+                self.language_model = None
+            else:
+                return labels[0].replace("__label__", "", 1) if labels else None
+        try:
+            return detect(text)
+        except LangDetectException:
+            return None
+
+    def _is_ad(self, text: str) -> bool:
+        text_head = text[:self.AD_SCAN_CHARS]
+        if self.ad_automaton is None:
+            return self.ad_regex.search(text_head) is not None
+        normalized = " ".join(text_head.lower().split())
+        return next(self.ad_automaton.iter(normalized), None) is not None
+
+    def _is_bot_author(self, author: str) -> bool:
+        lowered = author.lower()
+        return (
+            lowered.startswith(self.BOT_PREFIXES)
+            or lowered.endswith(self.BOT_SUFFIXES)
+            or any(keyword in lowered for keyword in self.BOT_KEYWORDS)
+        )
+
     def _get_engagement_score(self, item: CollectedItem) -> int:
-        metrics = item.metrics or {}
+        metrics = item.get_metrics()
         score = metrics.get("upvotes", 0) + metrics.get("num_comments", 0) * 2
         score += metrics.get("views", 0) // 1000 + metrics.get("likes", 0) * 10
         return score
 
+    def _compute_scores(self, items: List[CollectedItem]) -> np.ndarray:
+        """按 items 顺序返回热度分数组，同一条目在 preprocess/extract_top_items 间只计算一次"""
+        cache = self._score_cache
+        get_score = self._get_engagement_score
+        scores = np.empty(len(items), dtype=np.float64)
+        for pos, item in enumerate(items):
+            cached = cache.get(id(item))
+            if cached is None:
+                cached = cache[id(item)] = (item, get_score(item))
+            scores[pos] = cached[1]
+        return scores
+
     def extract_top_items(
         self,
         items: List[CollectedItem],
@@ -89,35 +194,35 @@ class DataPreprocessor:
         min_engagement: int = 5,
         ensure_platform_balance: bool = True,
     ) -> List[CollectedItem]:
-        filtered = [item for item in items if self._get_engagement_score(item) >= min_engagement]
+        scores = self._compute_scores(items)
         if not ensure_platform_balance:
-            return filtered[:limit]
+            return [items[i] for i in np.flatnonzero(scores >= min_engagement)[:limit]]
         if not items:
             return []
 
-        by_platform = {}
-        for item in items:
-            by_platform.setdefault(item.platform, []).append(item)
+        by_platform: Dict[str, List[Tuple[float, CollectedItem]]] = {}
+        for item, score in zip(items, scores.tolist()):
+            by_platform.setdefault(item.platform, []).append((score, item))
 
         for platform_items in by_platform.values():
-            platform_items.sort(key=self._get_engagement_score, reverse=True)
+            platform_items.sort(key=itemgetter(0), reverse=True)
 
         per_platform = max(1, limit // max(len(by_platform), 1))
         selected: List[CollectedItem] = []
         for platform_items in by_platform.values():
-            platform_filtered = [
-                item for item in platform_items
-                if self._get_engagement_score(item) >= min_engagement
-            ]
+            platform_filtered = [item for score, item in platform_items if score >= min_engagement]
             if not platform_filtered:
-                platform_filtered = platform_items
+                platform_filtered = [item for _, item in platform_items]
             selected.extend(platform_filtered[:per_platform])
 
-        if len(selected) < limit:
-            remaining = []
-            for platform_items in by_platform.values():
-                remaining.extend(platform_items[per_platform:])
-            remaining.sort(key=self._get_engagement_score, reverse=True)
-            selected.extend(remaining[: max(0, limit - len(selected))])
+        need = limit - len(selected)
+        if need > 0:
+            # 各平台列表已按热度降序，多路归并取前 need 条即可，无需整体重排
+            remaining = heapq.merge(
+                *(platform_items[per_platform:] for platform_items in by_platform.values()),
+                key=itemgetter(0),
+                reverse=True,
+            )
+            selected.extend(item for _, item in islice(remaining, need))
 
         return selected[:limit]
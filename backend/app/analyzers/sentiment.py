@@ -1,9 +1,13 @@
 """情感分析器"""
-from typing import List, Dict, Any
+import asyncio
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
 
-from app.analyzers.llm_client import LLMClient
+from app.analyzers.llm_cache import LLMCache
+from app.analyzers.llm_client import get_llm_client
 from app.analyzers.llm_validators import validate_sentiment_response
 from app.collectors.base import CollectedItem
+from app.config import get_settings
 from prompts.analysis_prompts import (
     SENTIMENT_SYSTEM_PROMPT,
     SENTIMENT_REPAIR_SYSTEM_PROMPT,
@@ -12,11 +16,28 @@ from prompts.analysis_prompts import (
 )
 
 
+@dataclass(slots=True)
+class ScoreInfo:
+    """单条数据的情感打分结果"""
+    score: Any = 50
+    key_phrases: Any = field(default_factory=list)
+
+    @classmethod
+    def from_entry(cls, entry: Any) -> Optional["ScoreInfo"]:
+        if not isinstance(entry, dict):
+            return None
+        return cls(entry.get("score", 50), entry.get("key_phrases", []))
+
+    def to_entry(self) -> Dict[str, Any]:
+        return {"score": self.score, "key_phrases": self.key_phrases}
+
+
 class SentimentAnalyzer:
     """情感分析器，使用LLM进行情感打分"""
 
     def __init__(self):
-        self.llm = LLMClient()
+        self.llm = get_llm_client()
+        self.max_concurrency = max(1, get_settings().llm_max_concurrency)
 
     async def analyze_batch(
         self,
@@ -24,64 +45,109 @@ class SentimentAnalyzer:
         keyword: str,
         batch_size: int = 10,
     ) -> List[Dict[str, Any]]:
-        results = []
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        # 各批次并发请求，信号量限制同时在途的 LLM 调用数
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch: List[CollectedItem]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._analyze_single_batch(batch, keyword)
 
-        for i in range(0, len(items), batch_size):
-            batch = items[i:i + batch_size]
-            batch_results = await self._analyze_single_batch(batch, keyword)
-            results.extend(batch_results)
+        batch_results = await asyncio.gather(*(run(batch) for batch in batches), return_exceptions=True)
 
+        results = []
+        for batch, batch_result in zip(batches, batch_results):
+            if isinstance(batch_result, BaseException):
+                batch_result = self._fallback_results(batch)
+            results.extend(batch_result)
         return results
 
     async def _analyze_single_batch(self, items: List[CollectedItem], keyword: str) -> List[Dict[str, Any]]:
-        texts = []
-        for idx, item in enumerate(items):
-            text = item.content or item.title or ""
-            if len(text) > 500:
-                text = text[:500] + "..."
-            texts.append(f"[{idx + 1}] {text}")
-
-        prompt = build_sentiment_user_prompt(texts, keyword)
-
-        try:
-            response = await self.llm.analyze_json_with_repair(
-                prompt=prompt,
-                system_prompt=SENTIMENT_SYSTEM_PROMPT,
-                repair_system_prompt=SENTIMENT_REPAIR_SYSTEM_PROMPT,
-                repair_user_prompt_builder=build_sentiment_repair_prompt,
-                validator=lambda data: validate_sentiment_response(data, len(texts)),
-            )
-            scores_data = response.get("scores", [])
-            if not isinstance(scores_data, list):
-                scores_data = []
-
-            index_map = {}
-            for entry in scores_data:
-                if not isinstance(entry, dict):
+        texts = [self._build_text(item) for item in items]
+
+        # 整批查一次缓存，只把未命中的条目发给 LLM
+        cache = self.llm.cache
+        keys: List[str] = []
+        score_infos: List[Optional[ScoreInfo]] = [None] * len(items)
+        if cache is not None:
+            keys = [self._cache_key(text, keyword) for text in texts]
+            score_infos = [ScoreInfo.from_entry(entry) for entry in await cache.get_many(keys)]
+
+        pending = [pos for pos, info in enumerate(score_infos) if info is None]
+        failed = False
+        if pending:
+            try:
+                fetched = await self._request_scores([texts[pos] for pos in pending], keyword)
+            except Exception:
+                failed = True
+            else:
+                for pos, info in zip(pending, fetched):
+                    score_infos[pos] = info
+                if cache is not None:
+                    await cache.set_many({
+                        keys[pos]: info.to_entry()
+                        for pos, info in zip(pending, fetched)
+                        if info is not None
+                    })
+
+        results = []
+        for item, score_info in zip(items, score_infos):
+            if score_info is None:
+                if failed:
+                    results.extend(self._fallback_results([item]))
                     continue
-                idx = entry.get("index")
-                if isinstance(idx, int):
-                    index_map[idx] = entry
-
-            results = []
-            for idx, item in enumerate(items, start=1):
-                score_info = index_map.get(idx)
-                if score_info is None and idx - 1 < len(scores_data):
-                    candidate = scores_data[idx - 1]
-                    score_info = candidate if isinstance(candidate, dict) else {}
-                if score_info is None:
-                    score_info = {}
-                results.append({
-                    "source_id": item.source_id,
-                    "score": score_info.get("score", 50),
-                    "key_phrases": score_info.get("key_phrases", []),
-                    "platform": item.platform,
-                    "engagement": item.metrics.get("upvotes", 0) + item.metrics.get("likes", 0),
-                })
-            return results
-
-        except Exception:
-            return [{"source_id": item.source_id, "score": 50, "key_phrases": [], "platform": item.platform, "engagement": 0} for item in items]
+                score_info = ScoreInfo()
+            metrics = item.get_metrics()
+            results.append({
+                "source_id": item.source_id,
+                "score": score_info.score,
+                "key_phrases": score_info.key_phrases,
+                "platform": item.platform,
+                "engagement": metrics.get("upvotes", 0) + metrics.get("likes", 0),
+            })
+        return results
+
+    def _fallback_results(self, items: List[CollectedItem]) -> List[Dict[str, Any]]:
+        return [{"source_id": item.source_id, "score": 50, "key_phrases": [], "platform": item.platform, "engagement": 0} for item in items]
+
+    def _build_text(self, item: CollectedItem) -> str:
+        text = item.display_text
+        return text if len(text) <= 500 else text[:500] + "..."
+
+    def _cache_key(self, text: str, keyword: str) -> str:
+        return LLMCache.make_key(task="sentiment", model=self.llm.model, keyword=keyword, text=text)
+
+    async def _request_scores(self, texts: List[str], keyword: str) -> List[Optional[ScoreInfo]]:
+        numbered = [f"[{idx}] {text}" for idx, text in enumerate(texts, start=1)]
+        prompt = build_sentiment_user_prompt(numbered, keyword)
+
+        response = await self.llm.analyze_json_with_repair(
+            prompt=prompt,
+            system_prompt=SENTIMENT_SYSTEM_PROMPT,
+            repair_system_prompt=SENTIMENT_REPAIR_SYSTEM_PROMPT,
+            repair_user_prompt_builder=build_sentiment_repair_prompt,
+            validator=lambda data: validate_sentiment_response(data, len(numbered)),
+            use_cache=False,
+        )
+        scores_data = response.get("scores", [])
+        if not isinstance(scores_data, list):
+            scores_data = []
+
+        index_map: Dict[int, ScoreInfo] = {}
+        for entry in scores_data:
+            if not isinstance(entry, dict):
+                continue
+            idx = entry.get("index")
+            if isinstance(idx, int):
+                index_map[idx] = ScoreInfo.from_entry(entry)
+
+        score_infos = []
+        for idx in range(1, len(texts) + 1):
+            score_info = index_map.get(idx)
+            if score_info is None and idx - 1 < len(scores_data):
+                score_info = ScoreInfo.from_entry(scores_data[idx - 1])
+            score_infos.append(score_info)
+        return score_infos
 
     def calculate_weighted_score(self, results: List[Dict[str, Any]]) -> int:
         if not results:
@@ -3,7 +3,9 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import Alert
@@ -11,39 +13,46 @@ from app.schemas import AlertResponse
 
 router = APIRouter()
 
+_ALERT_LIST_ADAPTER = TypeAdapter(List[AlertResponse])
+# 只读列表直接按列查询，不构造 ORM 实例
+_ALERT_COLUMNS = tuple(getattr(Alert, name) for name in AlertResponse.model_fields)
+
 
 @router.get("", response_model=List[AlertResponse])
 async def list_alerts(
     is_read: bool = Query(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """获取报警列表"""
-    query = db.query(Alert).order_by(Alert.created_at.desc())
+    stmt = select(*_ALERT_COLUMNS).order_by(Alert.created_at.desc()).limit(100)
 
     if is_read is not None:
-        query = query.filter(Alert.is_read == is_read)
+        stmt = stmt.where(Alert.is_read == is_read)
 
-    alerts = query.limit(100).all()
-    return [AlertResponse.model_validate(a) for a in alerts]
+    rows = (await db.execute(stmt)).mappings().all()
+    return _ALERT_LIST_ADAPTER.validate_python(rows)
 
 
 @router.put("/{alert_id}/read")
-async def mark_alert_read(alert_id: UUID, db: Session = Depends(get_db)):
+async def mark_alert_read(alert_id: UUID, db: AsyncSession = Depends(get_db)):
     """标记报警为已读"""
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
-    if not alert:
+    result = await db.execute(
+        update(Alert).where(Alert.id == alert_id).values(is_read=True).returning(Alert.id)
+    )
+    if result.first() is None:
         raise HTTPException(status_code=404, detail="报警不存在")
-
-    alert.is_read = True
-    db.commit()
+    await db.commit()
 
     return {"message": "已标记为已读"}
 
 
 @router.put("/read-all")
-async def mark_all_alerts_read(db: Session = Depends(get_db)):
+async def mark_all_alerts_read(db: AsyncSession = Depends(get_db)):
     """标记所有报警为已读"""
-    db.query(Alert).filter(Alert.is_read == False).update({"is_read": True})
-    db.commit()
+    result = await db.execute(
+        update(Alert).where(Alert.is_read.is_(False)).values(is_read=True).returning(Alert.id)
+    )
+    updated = len(result.all())
+    await db.commit()
 
-    return {"message": "已全部标记为已读"}
+    return {"message": "已全部标记为已读", "updated": updated}
@@ -1,27 +1,81 @@
 """API dependencies."""
+import hashlib
 from hmac import compare_digest
+from typing import Any, Iterable, Mapping, Optional
 
-from fastapi import Header, HTTPException, status
+from fastapi import Header, HTTPException, Request, Response, status
 
+from app.collectors import CollectorRegistry
 from app.config import get_settings
+from app.services.scheduler_service import SchedulerService
 
+# Settings are immutable for the process lifetime; encode the key once.
+_API_KEY_BYTES = get_settings().api_key.encode() or None
+_BEARER_PREFIX = "Bearer "
 
-def require_api_key(authorization: str | None = Header(default=None)) -> None:
+
+async def require_api_key(authorization: str | None = Header(default=None)) -> None:
     """Require a valid API key for all protected endpoints."""
-    settings = get_settings()
-    if not settings.api_key:
+    # async def: no blocking work here, so skip FastAPI's threadpool hop per request.
+    if _API_KEY_BYTES is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="API key not configured",
         )
-    if not authorization or not authorization.startswith("Bearer "):
+    if not authorization or not authorization.startswith(_BEARER_PREFIX):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing bearer token",
         )
-    token = authorization.removeprefix("Bearer ").strip()
-    if not token or not compare_digest(token, settings.api_key):
+    token = authorization[len(_BEARER_PREFIX):].strip()
+    if not token or not compare_digest(token.encode(), _API_KEY_BYTES):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
         )
+
+
+async def get_scheduler() -> SchedulerService:
+    """Inject the process-wide scheduler service."""
+    return SchedulerService.get_instance()
+
+
+def check_etag(request: Request, response: Response, *parts: Any) -> Optional[Response]:
+    """Weak ETag for polled GETs.
+
+    Returns a 304 response when ``If-None-Match`` still matches; otherwise sets the
+    caching headers on ``response`` and returns None so the handler does the real work.
+    """
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    headers = {"ETag": f'W/"{digest}"', "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or headers["ETag"] in (tag.strip() for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def validate_platforms(
+    platforms: Iterable[str],
+    platform_configs: Optional[Mapping[str, Any]] = None,
+    scope: str = "订阅",
+) -> None:
+    """Reject unknown platforms and configs for platforms outside the request with a 400."""
+    available = CollectorRegistry.platforms_set()
+    requested = set(platforms)
+    unsupported = requested - available
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不支持的平台: {', '.join(sorted(unsupported))}，支持的平台: {sorted(available)}",
+        )
+    # requested 已是 available 的子集，配置键只需落在 requested 内
+    outside = (platform_configs or {}).keys() - requested
+    if outside:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"平台配置未包含在{scope}平台列表: {', '.join(sorted(outside))}",
+        )
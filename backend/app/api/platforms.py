@@ -1,14 +1,18 @@
 """平台管理API"""
 from typing import List
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 
 from app.collectors import CollectorRegistry
 
 router = APIRouter()
 
+# 采集器在 app.collectors 导入时注册完毕，运行期不变，序列化一次即可
+_PLATFORMS_JSON = orjson.dumps(CollectorRegistry.list_platforms())
+
 
 @router.get("", response_model=List[str])
 async def list_platforms():
     """获取支持的平台列表"""
-    return CollectorRegistry.list_platforms()
+    return Response(content=_PLATFORMS_JSON, media_type="application/json")
@@ -1,9 +1,15 @@
 """任务相关API"""
-from typing import Optional
-from uuid import UUID
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import asyncio
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import Task, TaskStatus, RawData, AnalysisResult
@@ -18,83 +24,189 @@ from app.schemas import (
     TaskListResponse,
     TaskSummaryResponse,
 )
-from app.collectors import CollectorRegistry
+from app.api.deps import check_etag, validate_platforms
 from app.analyzers.mermaid import MermaidGenerator
 from app.analyzers.llm_validators import validate_mermaid_output
 
 router = APIRouter()
 
+# 列表接口只查询响应需要的列，跳过 ORM 实例构造
+_TASK_SUMMARY_COLUMNS = (
+    Task.id,
+    Task.keyword,
+    Task.platforms,
+    Task.status,
+    Task.progress,
+    Task.limit_count,
+    Task.error_message,
+    Task.created_at,
+    Task.updated_at,
+)
+_RAW_DATA_COLUMNS = (
+    RawData.id,
+    RawData.platform,
+    RawData.content_type,
+    RawData.title,
+    RawData.content,
+    RawData.author,
+    RawData.url,
+    RawData.metrics,
+    RawData.published_at,
+)
+
+
+def _encode_cursor(*parts: Any) -> str:
+    return base64.urlsafe_b64encode("|".join(str(part) for part in parts).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, size: int) -> List[str]:
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    if len(parts) != size:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    return parts
+
+
+async def _fetch_page(
+    db: AsyncSession,
+    stmt: Select,
+    page: int,
+    page_size: int,
+    keyset: Optional[ColumnElement] = None,
+    total: Optional[int] = None,
+) -> Tuple[List[Any], int]:
+    """返回 (当前页行, 总数)；传入 keyset 条件时按游标定位，否则按 OFFSET 分页
+
+    调用方已知筛选后的总数时传入 total，只查当前页、不再计数。
+    """
+    if total is not None:
+        if keyset is not None:
+            stmt = stmt.where(keyset)
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        return (await db.execute(stmt.limit(page_size))).all(), total
+
+    if keyset is not None:
+        rows = (await db.execute(stmt.where(keyset).limit(page_size))).all()
+        total = await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        return rows, total
+
+    # count(*) OVER () 与分页数据一次查询取回
+    rows = (
+        await db.execute(
+            stmt.add_columns(func.count().over().label("total"))
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+    ).all()
+    if rows:
+        return rows, rows[0].total
+    if page == 1:
+        return rows, 0
+    # 页码越界时窗口函数没有行可带回总数，单独 count 一次
+    total = await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+    return rows, total
+
+
+def _safe_mermaid_code(code: str, keyword: str, key_opinions: List[Any], sentiment_score: int) -> str:
+    valid, _ = validate_mermaid_output(code)
+    if valid:
+        return code
+    return MermaidGenerator().build_safe_mindmap(
+        keyword=keyword,
+        key_opinions=key_opinions,
+        sentiment_score=sentiment_score,
+    )
+
 
 @router.get("", response_model=TaskListResponse)
 async def list_tasks(
-    page: int = Query(default=1, ge=1),
+    request: Request,
+    response: Response,
+    page: int = Query(default=1, ge=1, deprecated=True),
     page_size: int = Query(default=20, ge=1, le=100),
     status: Optional[str] = Query(default=None),
     keyword: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(default=None, description="上一页返回的 next_cursor"),
+    db: AsyncSession = Depends(get_db),
 ):
     """任务列表（按时间倒序）"""
-    query = db.query(Task)
+    conditions = []
+    keyset = None
+    if cursor:
+        raw_ts, raw_id = _decode_cursor(cursor, 2)
+        try:
+            cursor_key = (datetime.fromisoformat(raw_ts), UUID(raw_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="无效的分页游标")
+        keyset = tuple_(Task.created_at, Task.id) < cursor_key
 
     if status:
         try:
             status_enum = TaskStatus(status)
         except ValueError:
             raise HTTPException(status_code=400, detail=f"无效状态: {status}")
-        query = query.filter(Task.status == status_enum)
+        conditions.append(Task.status == status_enum)
 
     if keyword:
-        query = query.filter(Task.keyword.ilike(f"%{keyword}%"))
-
-    total = query.count()
-    tasks = (
-        query.order_by(Task.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
+        conditions.append(Task.keyword.ilike(f"%{keyword}%"))
+
+    # 进度更新会刷新 updated_at；筛选范围内行数 + 最新修改时间不变则直接 304
+    matched, mtime = (
+        await db.execute(select(func.count(), func.max(Task.updated_at)).where(*conditions))
+    ).one()
+    not_modified = check_etag(
+        request, response, "tasks", matched, mtime, page, page_size, status, keyword, cursor
     )
+    if not_modified is not None:
+        return not_modified
+
+    rows, total = await _fetch_page(
+        db,
+        select(*_TASK_SUMMARY_COLUMNS).where(*conditions).order_by(Task.created_at.desc(), Task.id.desc()),
+        page,
+        page_size,
+        keyset,
+        total=matched,
+    )
+    next_cursor = None
+    if len(rows) == page_size:
+        next_cursor = _encode_cursor(rows[-1].created_at.isoformat(), rows[-1].id)
 
     return TaskListResponse(
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
         data=[
             TaskSummaryResponse(
-                task_id=task.id,
-                keyword=task.keyword,
-                platforms=task.platforms,
-                status=task.status.value,
-                progress=task.progress,
-                limit_count=task.limit_count,
-                error_message=task.error_message,
-                created_at=task.created_at,
-                updated_at=task.updated_at,
+                task_id=row.id,
+                keyword=row.keyword,
+                platforms=row.platforms,
+                status=row.status.value,
+                progress=row.progress,
+                limit_count=row.limit_count,
+                error_message=row.error_message,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
             )
-            for task in tasks
+            for row in rows
         ],
     )
 
 
 @router.post("", response_model=TaskResponse)
-async def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task_data: TaskCreate, db: AsyncSession = Depends(get_db)):
     """创建新的采集分析任务"""
-    available_platforms = set(CollectorRegistry.list_platforms())
-    for platform in task_data.platforms:
-        if platform not in available_platforms:
-            raise HTTPException(
-                status_code=400,
-                detail=f"不支持的平台: {platform}，支持的平台: {sorted(available_platforms)}"
-            )
-
+    validate_platforms(task_data.platforms, task_data.platform_configs, scope="任务")
     platform_configs = task_data.platform_configs or {}
-    if platform_configs:
-        for platform in platform_configs.keys():
-            if platform not in task_data.platforms:
-                raise HTTPException(status_code=400, detail=f"平台配置未包含在任务平台列表: {platform}")
-            if platform not in available_platforms:
-                raise HTTPException(status_code=400, detail=f"不支持的平台配置: {platform}")
 
+    # 预先生成 Celery task id，随任务记录一次写入；提交后再投递，避免 worker 读不到记录
+    celery_task_id = str(uuid4())
     task = Task(
+        id=uuid4(),
         keyword=task_data.keyword,
         language=task_data.language,
         report_language=task_data.report_language,
@@ -103,16 +215,14 @@ async def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
         platforms=task_data.platforms,
         platform_configs=platform_configs,
         status=TaskStatus.PENDING,
+        celery_task_id=celery_task_id,
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
 
     from app.workers.collect_tasks import collect_and_analyze
-    celery_task = collect_and_analyze.delay(str(task.id))
-
-    task.celery_task_id = celery_task.id
-    db.commit()
+    # 投递到 broker 是阻塞网络调用，放到线程中避免卡住事件循环
+    await asyncio.to_thread(collect_and_analyze.apply_async, args=[str(task.id)], task_id=celery_task_id)
 
     return TaskResponse(
         task_id=task.id,
@@ -122,9 +232,9 @@ async def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{task_id}", response_model=TaskStatusResponse)
-async def get_task_status(task_id: UUID, db: Session = Depends(get_db)):
+async def get_task_status(task_id: UUID, db: AsyncSession = Depends(get_db)):
     """查询任务状态"""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="任务不存在")
 
@@ -141,43 +251,46 @@ async def get_task_status(task_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.delete("/{task_id}")
-async def delete_task(task_id: UUID, db: Session = Depends(get_db)):
+async def delete_task(task_id: UUID, db: AsyncSession = Depends(get_db)):
     """删除任务及其关联数据"""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="任务不存在")
 
     if task.status in {TaskStatus.PENDING, TaskStatus.RUNNING}:
         raise HTTPException(status_code=409, detail="任务进行中，无法删除")
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
     return {"status": "deleted"}
 
 
 @router.get("/{task_id}/result", response_model=AnalysisResultResponse)
-async def get_task_result(task_id: UUID, db: Session = Depends(get_db)):
+async def get_task_result(task_id: UUID, db: AsyncSession = Depends(get_db)):
     """获取分析结果"""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="任务不存在")
 
     if task.status != TaskStatus.COMPLETED:
         raise HTTPException(status_code=400, detail=f"任务尚未完成，当前状态: {task.status.value}")
 
-    result = db.query(AnalysisResult).filter(AnalysisResult.task_id == task_id).first()
+    result = (
+        await db.execute(select(AnalysisResult).where(AnalysisResult.task_id == task_id))
+    ).scalars().first()
     if not result:
         raise HTTPException(status_code=404, detail="分析结果不存在")
 
     mermaid_code = result.mermaid_code
     if mermaid_code:
-        valid, _ = validate_mermaid_output(mermaid_code)
-        if not valid:
-            mermaid_code = MermaidGenerator().build_safe_mindmap(
-                keyword=task.keyword,
-                key_opinions=result.key_opinions,
-                sentiment_score=result.sentiment_score,
-            )
+        # 新结果在 worker 中已校验；旧数据的兜底校验放到线程里，避免阻塞事件循环
+        mermaid_code = await asyncio.to_thread(
+            _safe_mermaid_code,
+            mermaid_code,
+            task.keyword,
+            result.key_opinions,
+            result.sentiment_score,
+        )
 
     return AnalysisResultResponse(
         task_id=result.task_id,
@@ -195,37 +308,53 @@ async def get_task_result(task_id: UUID, db: Session = Depends(get_db)):
 @router.get("/{task_id}/raw-data", response_model=RawDataListResponse)
 async def get_raw_data(
     task_id: UUID,
-    page: int = Query(default=1, ge=1),
+    page: int = Query(default=1, ge=1, deprecated=True),
     page_size: int = Query(default=20, ge=1, le=100),
     platform: Optional[str] = Query(default=None),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(default=None, description="上一页返回的 next_cursor"),
+    db: AsyncSession = Depends(get_db),
 ):
     """获取原始采集数据"""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="任务不存在")
 
-    query = db.query(RawData).filter(RawData.task_id == task_id)
+    conditions = [RawData.task_id == task_id]
 
     if platform:
-        query = query.filter(RawData.platform == platform)
+        conditions.append(RawData.platform == platform)
 
-    total = query.count()
-    data = query.offset((page - 1) * page_size).limit(page_size).all()
+    keyset = None
+    if cursor:
+        (raw_id,) = _decode_cursor(cursor, 1)
+        try:
+            keyset = RawData.id > UUID(raw_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="无效的分页游标")
+
+    rows, total = await _fetch_page(
+        db,
+        select(*_RAW_DATA_COLUMNS).where(*conditions).order_by(RawData.id),
+        page,
+        page_size,
+        keyset,
+    )
+    next_cursor = _encode_cursor(rows[-1].id) if len(rows) == page_size else None
 
     return RawDataListResponse(
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
         data=[RawDataResponse(
-            id=item.id,
-            platform=item.platform.value,
-            content_type=item.content_type.value,
-            title=item.title,
-            content=item.content,
-            author=item.author,
-            url=item.url,
-            metrics=item.metrics,
-            published_at=item.published_at,
-        ) for item in data],
+            id=row.id,
+            platform=row.platform.value,
+            content_type=row.content_type.value,
+            title=row.title,
+            content=row.content,
+            author=row.author,
+            url=row.url,
+            metrics=row.metrics,
+            published_at=row.published_at,
+        ) for row in rows],
     )
@@ -1,11 +1,15 @@
 """采集器基类和注册机制"""
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Type
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Type
 
+# 只读空映射，供 metrics 缺省时共享，避免每次分配新 dict
+_EMPTY_METRICS: Mapping[str, Any] = MappingProxyType({})
 
-@dataclass
+
+@dataclass(slots=True)
 class CollectedItem:
     """采集到的数据项"""
     platform: str
@@ -15,10 +19,19 @@ class CollectedItem:
     content: Optional[str] = None
     author: Optional[str] = None
     url: Optional[str] = None
-    metrics: Dict = field(default_factory=dict)
-    extra_fields: Dict = field(default_factory=dict)
+    metrics: Optional[Dict] = None
+    extra_fields: Optional[Dict] = None
     published_at: Optional[datetime] = None
 
+    @property
+    def display_text(self) -> str:
+        """用于分析的正文：优先 content，其次 title"""
+        return self.content or self.title or ""
+
+    def get_metrics(self) -> Mapping[str, Any]:
+        """读取互动指标，未设置时返回只读空映射"""
+        return self.metrics or _EMPTY_METRICS
+
 
 class BaseCollector(ABC):
     """采集器基类"""
@@ -48,15 +61,26 @@ class BaseCollector(ABC):
     def is_valid_item(self, item: CollectedItem) -> bool:
         return bool(item.title or item.content)
 
+    @classmethod
+    async def aclose_shared(cls) -> None:
+        """释放当前事件循环上跨实例共享的资源（如连接池），默认无操作"""
+
+    def clean_batch(self, items: Iterable[Optional[CollectedItem]]) -> List[CollectedItem]:
+        """一次遍历过滤掉解析失败（None）和无文本的条目，规则同 is_valid_item"""
+        return [item for item in items if item is not None and (item.title or item.content)]
+
 
 class CollectorRegistry:
     """采集器注册表"""
 
     _collectors: Dict[str, Type[BaseCollector]] = {}
+    # 注册时同步更新，供请求校验直接做成员判断
+    _platforms_frozen: FrozenSet[str] = frozenset()
 
     @classmethod
     def register(cls, platform: str, collector_class: Type[BaseCollector]):
         cls._collectors[platform] = collector_class
+        cls._platforms_frozen = frozenset(cls._collectors)
 
     @classmethod
     def get(cls, platform: str) -> Optional[Type[BaseCollector]]:
@@ -64,11 +88,14 @@ class CollectorRegistry:
 
     @classmethod
     def get_instance(cls, platform: str, config: Dict = None) -> Optional[BaseCollector]:
-        collector_class = cls.get(platform)
-        if collector_class:
-            return collector_class(config)
-        return None
+        # 直接查表，不经过 get() 的额外调用；采集器可能持有会话状态，不缓存实例
+        collector_class = cls._collectors.get(platform)
+        return collector_class(config) if collector_class is not None else None
 
     @classmethod
     def list_platforms(cls) -> List[str]:
         return list(cls._collectors.keys())
+
+    @classmethod
+    def platforms_set(cls) -> FrozenSet[str]:
+        return cls._platforms_frozen
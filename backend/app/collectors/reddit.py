@@ -1,13 +1,18 @@
 """Reddit数据采集器 - 支持PRAW API和HTTP Fallback"""
 import asyncio
+import heapq
 import logging
 import random
 import re
 import time
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import weakref
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple
 
-import requests
+import httpx
+import orjson
 
 from app.collectors.base import BaseCollector, CollectedItem
 from app.config import get_settings
@@ -26,6 +31,65 @@ except ImportError:
     PRAW_AVAILABLE = False
     logger.warning("PRAW库未安装，将使用HTTP fallback模式")
 
+# HTTP fallback 并发获取评论的上限，兼作限速
+COMMENT_FETCH_CONCURRENCY = 8
+
+# Retry-After / 限额重置等待的上限（秒），避免服务端给出超长等待时阻塞整个采集
+RATE_LIMIT_MAX_WAIT = 60.0
+# 剩余请求额度低于该值时，在返回前主动等待
+RATE_LIMIT_LOW_WATERMARK = 3
+
+# Reddit 返回403（IP被封禁）后暂停 HTTP 请求的时长（秒）
+BLOCKED_COOLDOWN_S = 300.0
+
+# 视为未配置的 API 凭证占位符（小写）
+_PLACEHOLDER_VALUES = frozenset({'', 'your_client_id', 'your_client_secret', 'xxx', 'placeholder'})
+
+# 预生成的请求头数量，每次请求从中随机挑选
+HEADER_POOL_SIZE = 32
+
+_UTC = timezone.utc
+
+# 多关键词分隔符（中英文逗号、分号、斜杠、竖线、顿号）统一折叠为英文逗号后再 split
+_SEP_TABLE = str.maketrans({ch: "," for ch in "，;/|、"})
+
+# 机器人作者（含 AutoModerator），忽略大小写直接匹配原串，无需 lower()
+_BOT_RE = re.compile(r"bot|automod", re.IGNORECASE).search
+
+
+def _utc_datetime(created_utc: Any) -> Optional[datetime]:
+    """Reddit 的 created_utc（秒）转为带 UTC 时区的 datetime，与其他采集器一致"""
+    if not isinstance(created_utc, (int, float)):
+        if not created_utc:
+            return None
+        try:
+            created_utc = float(created_utc)
+        except (ValueError, TypeError):
+            return None
+    try:
+        return datetime.fromtimestamp(created_utc, _UTC)
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _should_fetch_comments(num_comments: Any, min_comments: int) -> bool:
+    """帖子自带评论数，过少时省掉一次评论请求；缺失该字段时照常请求"""
+    return not isinstance(num_comments, int) or num_comments >= min_comments
+
+
+@lru_cache(maxsize=1)
+def _header_pool() -> Tuple[Dict[str, str], ...]:
+    """首次请求时一次性生成请求头池；httpx 会复制请求头，池中 dict 可安全共享"""
+    return tuple(
+        {
+            'User-Agent': get_random_user_agent(),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': 'https://www.reddit.com/',
+        }
+        for _ in range(HEADER_POOL_SIZE)
+    )
+
 
 class RedditCollector(BaseCollector):
     """Reddit采集器，支持PRAW官方API和HTTP Fallback模式
@@ -38,6 +102,15 @@ class RedditCollector(BaseCollector):
 
     platform_name = "reddit"
 
+    # HTTP fallback 的连接池绑定在事件循环上，按 loop 分别创建并跨采集器实例复用；
+    # Celery worker 的采集 loop 常驻（见 collect_tasks._get_collect_loop），keep-alive 连接因此跨任务复用
+    _shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    # 403 熔断截止时间（monotonic），进程内所有实例共享
+    _blocked_until: float = 0.0
+
     def __init__(self, config: dict = None):
         super().__init__(config)
         settings = get_settings()
@@ -75,21 +148,31 @@ class RedditCollector(BaseCollector):
             return False
 
         # 检查是否是常见的占位符值
-        placeholder_values = ['', 'your_client_id', 'your_client_secret', 'xxx', 'placeholder']
-        if client_id.lower() in placeholder_values or client_secret.lower() in placeholder_values:
-            return False
+        return client_id.lower() not in _PLACEHOLDER_VALUES and client_secret.lower() not in _PLACEHOLDER_VALUES
 
-        return True
+    @staticmethod
+    def _int_option(platform_config: Dict, key: str, default: int) -> int:
+        """读取非负整数配置项，无法解析时使用默认值"""
+        try:
+            return max(0, int(platform_config.get(key, default)))
+        except (TypeError, ValueError):
+            return default
 
     def _normalize_query(self, keyword: str) -> str:
         if not keyword:
             return ""
-        parts = re.split(r"[，,;/|、]+", keyword)
-        cleaned = [p.strip() for p in parts if p.strip()]
+        # 每段只 strip 一次，并按首次出现顺序去重
+        cleaned = []
+        seen = set()
+        for part in keyword.translate(_SEP_TABLE).split(","):
+            part = part.strip()
+            if part and part not in seen:
+                seen.add(part)
+                cleaned.append(part)
         if len(cleaned) <= 1:
-            return keyword.strip()
+            return cleaned[0] if cleaned else keyword.strip()
         # Use OR to broaden matching across multiple keywords.
-        return " OR ".join(dict.fromkeys(cleaned))
+        return " OR ".join(cleaned)
 
     async def collect(
         self,
@@ -106,6 +189,27 @@ class RedditCollector(BaseCollector):
         else:
             return await self._collect_via_praw(search_query, limit, platform_config)
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """获取当前事件循环共享的 HTTP 客户端，搜索与评论请求复用 keep-alive 连接"""
+        loop = asyncio.get_running_loop()
+        client = self._shared_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                # 连接池排队不计入超时，并发评论请求在池满时等待而不是报错
+                timeout=httpx.Timeout(15.0, pool=None),
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8, keepalive_expiry=75.0),
+                follow_redirects=True,
+            )
+            self._shared_clients[loop] = client
+        return client
+
+    @classmethod
+    async def aclose_shared(cls) -> None:
+        """关闭当前事件循环上的共享客户端（在关闭 loop 前调用）"""
+        client = cls._shared_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
     async def _collect_via_praw(
         self,
         keyword: str,
@@ -113,26 +217,43 @@ class RedditCollector(BaseCollector):
         platform_config: Dict,
     ) -> List[CollectedItem]:
         """使用PRAW API采集数据"""
-        items = []
         subreddit = platform_config.get("subreddit", "all")
         sort = platform_config.get("sort", "relevance")
         time_filter = platform_config.get("time_filter", "week")
         include_comments = platform_config.get("include_comments", True)
-        comments_limit = platform_config.get("comments_limit", 10)
-        try:
-            comments_limit = max(0, int(comments_limit))
-        except (TypeError, ValueError):
-            comments_limit = 10
-
-        loop = asyncio.get_event_loop()
-        posts = await loop.run_in_executor(
-            None,
-            lambda: list(self.reddit.subreddit(subreddit).search(
-                keyword,
-                sort=sort,
-                time_filter=time_filter,
-                limit=limit,
-            ))
+        comments_limit = self._int_option(platform_config, "comments_limit", 10)
+        # 评论数低于该值的帖子不再请求评论，0 表示全部请求
+        min_comments = self._int_option(platform_config, "min_comments_for_fetch", 1)
+
+        # PRAW 的搜索、展开评论都是同步网络请求，整个采集放到一个线程任务中完成
+        return await asyncio.to_thread(
+            self._harvest_via_praw,
+            keyword,
+            limit,
+            subreddit,
+            sort,
+            time_filter,
+            comments_limit if include_comments else 0,
+            min_comments,
+        )
+
+    def _harvest_via_praw(
+        self,
+        keyword: str,
+        limit: int,
+        subreddit: str,
+        sort: str,
+        time_filter: str,
+        comments_limit: int,
+        min_comments: int = 1,
+    ) -> List[CollectedItem]:
+        """同步执行 PRAW 搜索并抓取评论，comments_limit 为 0 时不抓取评论"""
+        items = []
+        posts = self.reddit.subreddit(subreddit).search(
+            keyword,
+            sort=sort,
+            time_filter=time_filter,
+            limit=limit,
         )
 
         for post in posts:
@@ -140,20 +261,17 @@ class RedditCollector(BaseCollector):
             if post_item and self.is_valid_item(post_item):
                 items.append(post_item)
 
-            if include_comments and comments_limit > 0:
+            if comments_limit > 0 and _should_fetch_comments(getattr(post, 'num_comments', None), min_comments):
                 try:
                     post.comments.replace_more(limit=0)
-                    sample_limit = max(comments_limit * 2, comments_limit)
-                    top_comments = sorted(
-                        post.comments.list()[:sample_limit],
-                        key=lambda c: getattr(c, 'score', 0),
-                        reverse=True
-                    )[:comments_limit]
-
-                    for comment in top_comments:
-                        comment_item = self._parse_comment(comment, post)
-                        if comment_item and self.is_valid_item(comment_item):
-                            items.append(comment_item)
+                    # 在前 2k 条里取分数最高的 k 条，无需整体排序；score 可能为 None
+                    top_comments = heapq.nlargest(
+                        comments_limit,
+                        islice(post.comments.list(), comments_limit * 2),
+                        key=lambda c: getattr(c, 'score', 0) or 0,
+                    )
+
+                    items.extend(self.clean_batch(self._parse_comment(comment, post) for comment in top_comments))
                 except Exception:
                     pass
 
@@ -164,7 +282,7 @@ class RedditCollector(BaseCollector):
         keyword: str,
         limit: int,
         platform_config: Dict,
-        max_retries: int = 3,
+        max_retries: int = 2,
     ) -> List[CollectedItem]:
         """使用HTTP请求采集数据（fallback模式）
 
@@ -172,7 +290,7 @@ class RedditCollector(BaseCollector):
             keyword: 搜索关键词
             limit: 采集数量限制
             platform_config: 平台配置
-            max_retries: 整体采集失败时的最大重试次数
+            max_retries: 整体采集失败时的最大重试次数（单次请求已在内部重试）
 
         Returns:
             采集到的数据列表
@@ -181,30 +299,28 @@ class RedditCollector(BaseCollector):
         sort = platform_config.get("sort", "relevance")
         time_filter = platform_config.get("time_filter", "week")
         include_comments = platform_config.get("include_comments", True)
-        comments_limit = platform_config.get("comments_limit", 10)
-
-        try:
-            comments_limit = max(0, int(comments_limit))
-        except (TypeError, ValueError):
-            comments_limit = 10
+        comments_limit = self._int_option(platform_config, "comments_limit", 10)
+        # 评论数低于该值的帖子不再请求评论，0 表示全部请求
+        min_comments = self._int_option(platform_config, "min_comments_for_fetch", 1)
 
         last_error = None
 
         for attempt in range(max_retries):
+            if self._is_blocked():
+                logger.warning("Reddit HTTP采集: 近期被Reddit拒绝访问(403)，跳过本次采集")
+                return []
             try:
                 items = []
-                loop = asyncio.get_event_loop()
 
                 # 获取帖子
                 logger.info(f"Reddit HTTP采集: 搜索 '{keyword}'，第{attempt + 1}次尝试...")
-                posts_data = await loop.run_in_executor(
-                    None,
-                    lambda: self._http_search_posts(keyword, limit, subreddit, sort, time_filter)
-                )
+                posts_data = await self._http_search_posts(keyword, limit, subreddit, sort, time_filter)
 
                 if not posts_data:
+                    if self._is_blocked():
+                        return []
                     if attempt < max_retries - 1:
-                        wait_time = 2.0 * (2 ** attempt) + random.uniform(0, 1)
+                        wait_time = self._backoff(attempt)
                         logger.warning(f"Reddit HTTP采集: 未获取到帖子数据，{wait_time:.1f}s后重试...")
                         await asyncio.sleep(wait_time)
                         continue
@@ -214,23 +330,33 @@ class RedditCollector(BaseCollector):
 
                 logger.info(f"Reddit HTTP采集: 获取到 {len(posts_data)} 个帖子")
 
-                for post_data in posts_data:
-                    post_item = self._parse_post_from_json(post_data)
-                    if post_item and self.is_valid_item(post_item):
-                        items.append(post_item)
-
-                        # 获取评论
-                        if include_comments and comments_limit > 0:
-                            post_id = post_data.get('id')
-                            post_subreddit = post_data.get('subreddit')
-                            if post_id and post_subreddit:
-                                comments_data = await self._fetch_comments_with_retry(
-                                    post_id, post_subreddit, comments_limit, loop
-                                )
-                                for comment_data in comments_data:
-                                    comment_item = self._parse_comment_from_json(comment_data, post_data)
-                                    if comment_item and self.is_valid_item(comment_item):
-                                        items.append(comment_item)
+                # 长正文的清洗解析放到线程中，不占用事件循环
+                parsed_posts = await asyncio.to_thread(self._parse_posts_batch, posts_data)
+
+                # 各帖子的评论有界并发获取，结果按帖子顺序拼接
+                if include_comments and comments_limit > 0:
+                    semaphore = asyncio.Semaphore(COMMENT_FETCH_CONCURRENCY)
+                    comment_batches = await asyncio.gather(
+                        *(
+                            self._collect_comments_for_post(post_data, comments_limit, min_comments, semaphore)
+                            for _, post_data in parsed_posts
+                        ),
+                        return_exceptions=True,
+                    )
+                else:
+                    comment_batches = [[]] * len(parsed_posts)
+
+                seen_comments = set()
+                for (post_item, post_data), comments in zip(parsed_posts, comment_batches):
+                    items.append(post_item)
+                    if isinstance(comments, BaseException):
+                        logger.debug(f"获取帖子 {post_data.get('id')} 评论异常: {type(comments).__name__}: {comments}")
+                        continue
+                    for comment in comments:
+                        if comment.source_id in seen_comments:
+                            continue
+                        seen_comments.add(comment.source_id)
+                        items.append(comment)
 
                 logger.info(f"Reddit HTTP采集完成: 共获取 {len(items)} 条数据")
                 return items
@@ -243,7 +369,7 @@ class RedditCollector(BaseCollector):
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
-                    wait_time = 2.0 * (2 ** attempt) + random.uniform(0, 1)
+                    wait_time = self._backoff(attempt)
                     logger.warning(
                         f"Reddit HTTP采集异常({type(e).__name__}: {e})，"
                         f"第{attempt + 1}/{max_retries}次重试，等待 {wait_time:.1f}s..."
@@ -254,34 +380,76 @@ class RedditCollector(BaseCollector):
 
         return []
 
+    def _parse_posts_batch(self, posts_data: List[Dict]) -> List[Tuple[CollectedItem, Dict]]:
+        """批量解析帖子，返回 (帖子条目, 原始数据)；同步执行，供线程池调用"""
+        # 搜索结果可能重复返回同一帖子，按 id 去重后再解析，也避免重复拉取评论
+        parsed_posts: List[Tuple[CollectedItem, Dict]] = []
+        seen_posts = set()
+        for post_data in posts_data:
+            post_id = post_data.get('id')
+            if post_id:
+                if post_id in seen_posts:
+                    continue
+                seen_posts.add(post_id)
+            post_item = self._parse_post_from_json(post_data)
+            if post_item and self.is_valid_item(post_item):
+                parsed_posts.append((post_item, post_data))
+        return parsed_posts
+
+    @classmethod
+    def _is_blocked(cls) -> bool:
+        return time.monotonic() < cls._blocked_until
+
+    @staticmethod
+    def _backoff(attempt: int, base: float = 2.0, cap: float = 30.0) -> float:
+        """指数退避等待时间：封顶 cap 秒，叠加不超过 1 秒的随机抖动"""
+        return min(cap, base * (2 ** attempt)) + random.uniform(0, min(1.0, base))
+
     def _get_random_headers(self) -> Dict[str, str]:
         """获取随机的请求头"""
-        return {
-            'User-Agent': get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.reddit.com/',
-        }
+        return random.choice(_header_pool())
+
+    @staticmethod
+    def _header_seconds(response: httpx.Response, name: str) -> Optional[float]:
+        """读取秒数类型的响应头（Retry-After、X-Ratelimit-*），无法解析时返回None"""
+        value = response.headers.get(name)
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            return None
+        return seconds if seconds >= 0 else None
+
+    async def _respect_rate_limit(self, response: httpx.Response) -> None:
+        """额度即将耗尽时按重置时间均摊等待，避免下一次请求直接触发429"""
+        remaining = self._header_seconds(response, 'X-Ratelimit-Remaining')
+        reset = self._header_seconds(response, 'X-Ratelimit-Reset')
+        if remaining is None or reset is None or remaining >= RATE_LIMIT_LOW_WATERMARK:
+            return
+        wait_time = min(RATE_LIMIT_MAX_WAIT, reset / max(remaining, 1))
+        logger.info(f"Reddit剩余请求额度 {remaining:.0f}，主动等待 {wait_time:.1f}s")
+        await asyncio.sleep(wait_time)
 
     def _is_retryable_error(self, exception: Exception) -> bool:
         """判断异常是否可重试"""
         retryable_exceptions = (
-            requests.exceptions.Timeout,
-            requests.exceptions.ConnectionError,
-            requests.exceptions.ChunkedEncodingError,
+            httpx.TimeoutException,
+            httpx.NetworkError,
+            httpx.RemoteProtocolError,
             ConnectionResetError,
             ConnectionRefusedError,
             ConnectionAbortedError,
         )
         return isinstance(exception, retryable_exceptions)
 
-    def _http_request_with_retry(
+    async def _http_request_with_retry(
         self,
         url: str,
         params: Dict = None,
         max_retries: int = 3,
         base_delay: float = 2.0,
-    ) -> Optional[Dict]:
+    ) -> Optional[Any]:
         """带重试的HTTP请求
 
         Args:
@@ -293,34 +461,41 @@ class RedditCollector(BaseCollector):
         Returns:
             响应JSON数据，失败返回None
         """
+        if self._is_blocked():
+            return None
+
         last_exception = None
+        client = self._get_http_client()
 
         for attempt in range(max_retries):
             try:
                 headers = self._get_random_headers()
-                response = requests.get(
-                    url,
-                    headers=headers,
-                    params=params,
-                    timeout=15,
-                )
+                response = await client.get(url, headers=headers, params=params)
 
                 if response.status_code == 200:
-                    return response.json()
+                    data = orjson.loads(response.content)
+                    await self._respect_rate_limit(response)
+                    return data
                 elif response.status_code == 429:
-                    # Rate limit，等待后重试
-                    wait_time = base_delay * (2 ** attempt) + random.uniform(0, 1)
+                    # Rate limit，优先按服务端的 Retry-After 等待
+                    retry_after = self._header_seconds(response, 'Retry-After')
+                    if retry_after is not None:
+                        wait_time = min(RATE_LIMIT_MAX_WAIT, retry_after)
+                    else:
+                        wait_time = self._backoff(attempt, base_delay)
                     logger.warning(f"Reddit rate limit (429)，第{attempt + 1}次重试，等待 {wait_time:.1f}s...")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
                 elif response.status_code in (500, 502, 503, 504):
                     # 服务器错误，可重试
-                    wait_time = base_delay * (2 ** attempt) + random.uniform(0, 1)
+                    wait_time = self._backoff(attempt, base_delay)
                     logger.warning(f"Reddit服务器错误({response.status_code})，第{attempt + 1}次重试，等待 {wait_time:.1f}s...")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
                 elif response.status_code == 403:
-                    logger.error("Reddit返回403禁止访问，停止重试")
+                    # 被封禁时后续请求同样会失败，熔断一段时间
+                    type(self)._blocked_until = time.monotonic() + BLOCKED_COOLDOWN_S
+                    logger.error(f"Reddit返回403禁止访问，停止重试，{BLOCKED_COOLDOWN_S:.0f}s内不再发起请求")
                     return None
                 elif response.status_code == 404:
                     logger.warning("Reddit返回404未找到")
@@ -329,38 +504,38 @@ class RedditCollector(BaseCollector):
                     logger.warning(f"Reddit HTTP请求失败，状态码: {response.status_code}")
                     # 非预期状态码，尝试重试
                     if attempt < max_retries - 1:
-                        time.sleep(base_delay)
+                        await asyncio.sleep(base_delay)
                         continue
 
-            except requests.exceptions.Timeout as e:
+            except httpx.TimeoutException as e:
                 last_exception = e
-                wait_time = base_delay * (2 ** attempt)
+                wait_time = self._backoff(attempt, base_delay)
                 logger.warning(f"Reddit请求超时，第{attempt + 1}/{max_retries}次重试，等待 {wait_time:.1f}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
 
-            except requests.exceptions.ConnectionError as e:
+            except httpx.NetworkError as e:
                 last_exception = e
-                wait_time = base_delay * (2 ** attempt)
+                wait_time = self._backoff(attempt, base_delay)
                 logger.warning(f"Reddit连接错误({type(e).__name__})，第{attempt + 1}/{max_retries}次重试，等待 {wait_time:.1f}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
 
-            except requests.exceptions.ChunkedEncodingError as e:
+            except httpx.RemoteProtocolError as e:
                 last_exception = e
-                wait_time = base_delay * (2 ** attempt)
+                wait_time = self._backoff(attempt, base_delay)
                 logger.warning(f"Reddit响应编码错误，第{attempt + 1}/{max_retries}次重试，等待 {wait_time:.1f}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
 
             except (ConnectionResetError, ConnectionRefusedError, ConnectionAbortedError) as e:
                 last_exception = e
-                wait_time = base_delay * (2 ** attempt)
+                wait_time = self._backoff(attempt, base_delay)
                 logger.warning(f"网络连接被重置/拒绝({type(e).__name__})，第{attempt + 1}/{max_retries}次重试，等待 {wait_time:.1f}s...")
-                time.sleep(wait_time)
+                await asyncio.sleep(wait_time)
                 continue
 
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPError as e:
                 # 其他请求异常，不可重试
                 logger.error(f"Reddit请求异常(不可重试): {type(e).__name__}: {e}")
                 return None
@@ -376,7 +551,7 @@ class RedditCollector(BaseCollector):
 
         return None
 
-    def _http_search_posts(
+    async def _http_search_posts(
         self,
         keyword: str,
         limit: int,
@@ -401,7 +576,7 @@ class RedditCollector(BaseCollector):
             'raw_json': 1,
         }
 
-        data = self._http_request_with_retry(url, params)
+        data = await self._http_request_with_retry(url, params)
         if not data:
             return []
 
@@ -412,12 +587,32 @@ class RedditCollector(BaseCollector):
             logger.error(f"解析Reddit搜索结果失败: {e}")
             return []
 
+    async def _collect_comments_for_post(
+        self,
+        post_data: Dict,
+        comments_limit: int,
+        min_comments: int,
+        semaphore: asyncio.Semaphore,
+    ) -> List[CollectedItem]:
+        """获取并解析单个帖子的评论"""
+        post_id = post_data.get('id')
+        post_subreddit = post_data.get('subreddit')
+        if not post_id or not post_subreddit:
+            return []
+        if not _should_fetch_comments(post_data.get('num_comments'), min_comments):
+            return []
+        async with semaphore:
+            comments_data = await self._fetch_comments_with_retry(post_id, post_subreddit, comments_limit)
+        return self.clean_batch(
+            self._parse_comment_from_json(comment_data, post_data)
+            for comment_data in comments_data
+        )
+
     async def _fetch_comments_with_retry(
         self,
         post_id: str,
         subreddit: str,
         comments_limit: int,
-        loop: asyncio.AbstractEventLoop,
         max_retries: int = 3,
         base_delay: float = 1.0,
     ) -> List[Dict]:
@@ -427,7 +622,6 @@ class RedditCollector(BaseCollector):
             post_id: 帖子ID
             subreddit: 子版块名称
             comments_limit: 评论数量限制
-            loop: 事件循环
             max_retries: 最大重试次数
             base_delay: 基础延迟时间（秒）
 
@@ -437,21 +631,14 @@ class RedditCollector(BaseCollector):
         last_exception = None
 
         for attempt in range(max_retries):
-            # 添加随机延迟避免被限速
+            # 首次请求不再预先等待，限速由调用方的并发信号量控制
             if attempt > 0:
-                wait_time = base_delay * (2 ** (attempt - 1)) + random.uniform(0.3, 0.8)
+                wait_time = self._backoff(attempt - 1, base_delay)
                 logger.debug(f"评论获取重试等待 {wait_time:.1f}s (帖子 {post_id})")
                 await asyncio.sleep(wait_time)
-            else:
-                await asyncio.sleep(random.uniform(0.5, 1.5))
 
             try:
-                comments_data = await loop.run_in_executor(
-                    None,
-                    lambda pid=post_id, psub=subreddit: self._http_get_comments(
-                        pid, psub, comments_limit
-                    )
-                )
+                comments_data = await self._http_get_comments(post_id, subreddit, comments_limit)
 
                 if comments_data:
                     return comments_data
@@ -461,9 +648,9 @@ class RedditCollector(BaseCollector):
                     logger.debug(f"帖子 {post_id} 评论为空，第{attempt + 1}/{max_retries}次重试...")
                     continue
 
-            except (requests.exceptions.Timeout,
-                    requests.exceptions.ConnectionError,
-                    requests.exceptions.ChunkedEncodingError,
+            except (httpx.TimeoutException,
+                    httpx.NetworkError,
+                    httpx.RemoteProtocolError,
                     ConnectionResetError,
                     ConnectionRefusedError,
                     ConnectionAbortedError) as e:
@@ -487,7 +674,7 @@ class RedditCollector(BaseCollector):
 
         return []
 
-    def _http_get_comments(
+    async def _http_get_comments(
         self,
         post_id: str,
         subreddit: str,
@@ -503,7 +690,7 @@ class RedditCollector(BaseCollector):
             'raw_json': 1,
         }
 
-        data = self._http_request_with_retry(url, params)
+        data = await self._http_request_with_retry(url, params)
         if not data:
             return []
 
@@ -517,9 +704,8 @@ class RedditCollector(BaseCollector):
                         comment_body = comment.get('data', {})
                         if comment_body:
                             result.append(comment_body)
-                # 按分数排序并限制数量
-                result.sort(key=lambda x: x.get('score', 0), reverse=True)
-                return result[:limit]
+                # 取分数最高的 limit 条
+                return heapq.nlargest(limit, result, key=lambda x: x.get('score', 0))
             return []
         except (KeyError, TypeError, IndexError) as e:
             logger.error(f"解析Reddit评论失败: {e}")
@@ -546,7 +732,7 @@ class RedditCollector(BaseCollector):
                     "subreddit": str(post.subreddit),
                     "is_video": post.is_video,
                 },
-                published_at=datetime.utcfromtimestamp(post.created_utc),
+                published_at=_utc_datetime(post.created_utc),
             )
         except Exception:
             return None
@@ -558,7 +744,7 @@ class RedditCollector(BaseCollector):
                 return None
 
             author = str(comment.author) if comment.author else None
-            if author and "bot" in author.lower():
+            if author and _BOT_RE(author):
                 return None
 
             return CollectedItem(
@@ -574,7 +760,7 @@ class RedditCollector(BaseCollector):
                     "post_id": post.id,
                     "subreddit": str(post.subreddit),
                 },
-                published_at=datetime.utcfromtimestamp(comment.created_utc),
+                published_at=_utc_datetime(comment.created_utc),
             )
         except Exception:
             return None
@@ -582,40 +768,30 @@ class RedditCollector(BaseCollector):
     def _parse_post_from_json(self, post_data: Dict) -> Optional[CollectedItem]:
         """从JSON数据解析帖子（HTTP fallback模式使用）"""
         try:
-            title = self.clean_text(post_data.get('title', ''))
-            selftext = post_data.get('selftext', '')
-            content = self.clean_text(selftext) if selftext else None
-
-            # 获取发布时间
-            created_utc = post_data.get('created_utc')
-            published_at = None
-            if created_utc:
-                try:
-                    published_at = datetime.utcfromtimestamp(float(created_utc))
-                except (ValueError, TypeError):
-                    pass
-
-            permalink = post_data.get('permalink', '')
-            url = f"https://reddit.com{permalink}" if permalink else None
+            # 字段结构固定，绑定局部变量减少逐字段的属性查找
+            get = post_data.get
+            clean_text = self.clean_text
+            selftext = get('selftext')
+            permalink = get('permalink')
 
             return CollectedItem(
                 platform=self.platform_name,
                 content_type="post",
-                source_id=post_data.get('id', ''),
-                title=title,
-                content=content,
-                author=post_data.get('author'),
-                url=url,
+                source_id=get('id', ''),
+                title=clean_text(get('title', '')),
+                content=clean_text(selftext) if selftext else None,
+                author=get('author'),
+                url=f"https://reddit.com{permalink}" if permalink else None,
                 metrics={
-                    "upvotes": post_data.get('score', 0),
-                    "upvote_ratio": post_data.get('upvote_ratio', 0),
-                    "num_comments": post_data.get('num_comments', 0),
+                    "upvotes": get('score', 0),
+                    "upvote_ratio": get('upvote_ratio', 0),
+                    "num_comments": get('num_comments', 0),
                 },
                 extra_fields={
-                    "subreddit": post_data.get('subreddit', ''),
-                    "is_video": post_data.get('is_video', False),
+                    "subreddit": get('subreddit', ''),
+                    "is_video": get('is_video', False),
                 },
-                published_at=published_at,
+                published_at=_utc_datetime(get('created_utc')),
             )
         except Exception as e:
             logger.debug(f"解析帖子JSON失败: {e}")
@@ -628,28 +804,19 @@ class RedditCollector(BaseCollector):
     ) -> Optional[CollectedItem]:
         """从JSON数据解析评论（HTTP fallback模式使用）"""
         try:
-            body = comment_data.get('body', '')
-            content = self.clean_text(body)
+            get = comment_data.get
+            content = self.clean_text(get('body', ''))
 
             if not content or content in ["[deleted]", "[removed]"]:
                 return None
 
-            author = comment_data.get('author')
-            if author and "bot" in author.lower():
+            author = get('author')
+            if author and _BOT_RE(author):
                 return None
 
-            # 获取发布时间
-            created_utc = comment_data.get('created_utc')
-            published_at = None
-            if created_utc:
-                try:
-                    published_at = datetime.utcfromtimestamp(float(created_utc))
-                except (ValueError, TypeError):
-                    pass
-
-            post_permalink = post_data.get('permalink', '')
-            comment_id = comment_data.get('id', '')
-            url = f"https://reddit.com{post_permalink}{comment_id}" if post_permalink else None
+            post_get = post_data.get
+            post_permalink = post_get('permalink')
+            comment_id = get('id', '')
 
             return CollectedItem(
                 platform=self.platform_name,
@@ -658,13 +825,13 @@ class RedditCollector(BaseCollector):
                 title=None,
                 content=content,
                 author=author,
-                url=url,
-                metrics={"upvotes": comment_data.get('score', 0)},
+                url=f"https://reddit.com{post_permalink}{comment_id}" if post_permalink else None,
+                metrics={"upvotes": get('score', 0)},
                 extra_fields={
-                    "post_id": post_data.get('id', ''),
-                    "subreddit": post_data.get('subreddit', ''),
+                    "post_id": post_get('id', ''),
+                    "subreddit": post_get('subreddit', ''),
                 },
-                published_at=published_at,
+                published_at=_utc_datetime(get('created_utc')),
             )
         except Exception as e:
             logger.debug(f"解析评论JSON失败: {e}")
@@ -2,14 +2,20 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
 import random
 import re
-from dataclasses import dataclass
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, replace
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import quote_plus
 
 from app.collectors.base import BaseCollector, CollectedItem
@@ -17,6 +23,64 @@ from scripts.user_agent_generator import get_random_user_agent
 
 logger = logging.getLogger(__name__)
 
+# 计数文本，如 "1.5K"、"12 replies"
+_COUNT_RE = re.compile(r"([\d.]+)\s*([km]?)")
+
+# 滚动后最多等待新内容加载的时间
+SCROLL_WAIT_TIMEOUT_MS = 1500
+_SCROLL_TO_BOTTOM_JS = "() => { window.scrollTo(0, document.body.scrollHeight); return document.body.scrollHeight; }"
+
+# 决定登录身份的 cookie
+_LOGIN_COOKIE_NAMES = frozenset({"auth_token", "ct0"})
+
+_SORT_KEYS = frozenset({"top", "relevance"})
+
+# 抓取只需要 DOM 文本，这些资源类型和统计/广告请求直接拦截（x_block_media）
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+_BLOCKED_URL_MARKERS = ("google-analytics", "doubleclick", "adsct")
+
+# 在页面内一次性提取所有推文的原始字段；计数取 aria-label，缺失时退回可见文本
+_EXTRACT_TWEETS_JS = """
+() => {
+  const attr = (root, selector, name) => {
+    const el = root.querySelector(selector);
+    return el ? el.getAttribute(name) : null;
+  };
+  const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText : null;
+  };
+  const count = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? (el.getAttribute("aria-label") || el.innerText) : null;
+  };
+  return Array.from(document.querySelectorAll('article[data-testid="tweet"]'), (article) => {
+    const nameBox = article.querySelector('div[data-testid="User-Name"]');
+    let authorName = null;
+    if (nameBox) {
+      for (const span of nameBox.querySelectorAll("span")) {
+        const value = span.innerText.trim();
+        if (value && !value.startsWith("@")) {
+          authorName = value;
+          break;
+        }
+      }
+    }
+    return {
+      url: attr(article, 'a[href*="/status/"]', "href"),
+      text: text(article, 'div[data-testid="tweetText"]'),
+      author_name: authorName,
+      author_href: attr(article, 'div[data-testid="User-Name"] a', "href"),
+      datetime: attr(article, "time", "datetime"),
+      reply: count(article, 'div[data-testid="reply"]'),
+      retweet: count(article, 'div[data-testid="retweet"]'),
+      like: count(article, 'div[data-testid="like"]'),
+      views: count(article, 'a[href*="/analytics"]') || count(article, 'div[data-testid="viewCount"]'),
+    };
+  });
+}
+"""
+
 
 @dataclass
 class XAccount:
@@ -31,7 +95,8 @@ class XAccount:
 class XAccountPool:
     def __init__(self, accounts: List[XAccount]):
         self.accounts = accounts
-        self._cursor = 0
+        # 轮询队列只保存 active 账号，取用时 rotate，暂停时移出
+        self._active = deque(acc for acc in accounts if acc.status == "active")
 
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> "XAccountPool":
@@ -49,7 +114,14 @@ class XAccountPool:
     @staticmethod
     def _load_from_file(path: str) -> List[XAccount]:
         try:
-            raw = Path(path).read_text(encoding="utf-8")
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = _ACCOUNT_FILE_CACHE.get(path)
+            if cached is not None and cached[0] == signature:
+                raw = cached[1]
+            else:
+                raw = Path(path).read_text(encoding="utf-8")
+                _ACCOUNT_FILE_CACHE[path] = (signature, raw)
         except FileNotFoundError:
             logger.warning("X accounts file not found: %s", path)
             return []
@@ -60,6 +132,11 @@ class XAccountPool:
 
     @staticmethod
     def _parse_accounts(raw: str) -> List[XAccount]:
+        # 解析结果按原始 JSON 缓存；每个池拿到副本，error_count/status 等状态互不影响
+        return [replace(account) for account in _parse_accounts_cached(raw)]
+
+    @staticmethod
+    def _parse_accounts_uncached(raw: str) -> List[XAccount]:
         try:
             data = json.loads(raw)
         except json.JSONDecodeError as exc:
@@ -107,29 +184,53 @@ class XAccountPool:
         return bool(self.accounts)
 
     def get_next_account(self) -> Optional[XAccount]:
-        active_accounts = [acc for acc in self.accounts if acc.status == "active"]
-        if not active_accounts:
+        if not self._active:
             return None
-        account = active_accounts[self._cursor % len(active_accounts)]
-        self._cursor += 1
+        account = self._active[0]
+        self._active.rotate(-1)
         account.last_used_at = datetime.utcnow()
         return account
 
     def mark_failure(self, account: XAccount, max_errors: int = 3) -> None:
         account.error_count += 1
-        if account.error_count >= max_errors:
+        if account.error_count >= max_errors and account.status == "active":
             account.status = "paused"
+            try:
+                self._active.remove(account)
+            except ValueError:
+                pass
 
     def mark_success(self, account: XAccount) -> None:
         account.error_count = 0
 
 
+# 账号文件按 (mtime, size) 缓存内容，未变化时不再读盘
+_ACCOUNT_FILE_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+@lru_cache(maxsize=8)
+def _parse_accounts_cached(raw: str) -> Tuple[XAccount, ...]:
+    return tuple(XAccountPool._parse_accounts_uncached(raw))
+
+
 class XCollector(BaseCollector):
     """Framework for X (Twitter) collection via Playwright + cookies."""
 
     platform_name = "x"
     _status_re = re.compile(r"/status/(\d+)")
 
+    # Chromium 冷启动开销大：按 (headless, proxy) 在事件循环上缓存浏览器，每次采集只新建 context；
+    # Celery worker 的采集 loop 常驻（见 collect_tasks._get_collect_loop），浏览器因此跨任务复用
+    _browsers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[bool, Optional[str]], Tuple[Any, Any]]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _browser_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+        weakref.WeakKeyDictionary()
+    )
+    # (account_id, 登录 cookie 摘要) -> 登录校验有效期截止（monotonic）；有效期内跳过打开 /home 和登录检查。
+    # 账号文件更新后 cookie 变化，旧条目不会命中
+    _login_cache: Dict[Tuple[str, str], float] = {}
+
     def __init__(self, config: Dict = None):
         super().__init__(config)
         self.platform_config = self.config.get("platform_config", {}) or {}
@@ -139,6 +240,9 @@ class XCollector(BaseCollector):
         self.user_agent = self.config.get("x_user_agent") or None
         self.timeout_ms = int(self.config.get("x_timeout_ms", 30000))
         self.max_account_errors = int(self.config.get("x_account_error_limit", 3))
+        self.reply_concurrency = max(1, int(self.config.get("x_reply_concurrency", 4)))
+        self.block_media = bool(self.config.get("x_block_media", True))
+        self.login_ttl_s = max(0, int(self.config.get("x_login_ttl_s", 1800)))
 
     async def collect(
         self,
@@ -228,54 +332,96 @@ class XCollector(BaseCollector):
             logger.warning("Playwright not available: %s", exc)
             return []
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=self.headless,
-                proxy=_build_proxy(self.proxy),
-            )
-            locale = "en-US" if language == "en" else "zh-CN"
-            user_agent = self.user_agent or get_random_user_agent()
-            context = await browser.new_context(
-                user_agent=user_agent,
-                locale=locale,
-                viewport={"width": 1280, "height": 720},
-            )
+        browser = await self._ensure_browser(async_playwright)
+        locale = "en-US" if language == "en" else "zh-CN"
+        user_agent = self.user_agent or get_random_user_agent()
+        context = await browser.new_context(
+            user_agent=user_agent,
+            locale=locale,
+            viewport={"width": 1280, "height": 720},
+        )
+        try:
+            if self.block_media:
+                await context.route("**/*", _block_nonessential)
             await context.add_cookies(account.cookies)
 
-            try:
-                page = await context.new_page()
-                page.set_default_timeout(self.timeout_ms)
+            page = await context.new_page()
+            page.set_default_timeout(self.timeout_ms)
 
+            login_key = _login_cache_key(account)
+            if self._login_cache.get(login_key, 0.0) <= time.monotonic():
                 await page.goto("https://x.com/home", wait_until="domcontentloaded")
                 is_logged_in = await self._is_logged_in(page)
                 if not is_logged_in:
                     raise RuntimeError("X login failed or cookies expired.")
                 logger.info("X login check OK for account: %s", account.label)
+                if self.login_ttl_s:
+                    self._login_cache[login_key] = time.monotonic() + self.login_ttl_s
 
-                posts = await self._collect_search_posts(
-                    page=page,
-                    keyword=keyword,
-                    limit=limit,
-                    language=language,
-                    sort=sort,
-                )
+            posts = await self._collect_search_posts(
+                page=page,
+                keyword=keyword,
+                limit=limit,
+                language=language,
+                sort=sort,
+            )
 
-                items = list(posts)
-                logger.info("X search collected posts: %s", len(posts))
-                if include_replies and posts and max_replies > 0:
-                    replies = await self._collect_replies(
-                        context=context,
-                        posts=posts,
-                        max_replies=max_replies,
-                        reply_depth=reply_depth,
-                    )
-                    items.extend(replies)
-                    logger.info("X replies collected: %s", len(replies))
+            items = list(posts)
+            logger.info("X search collected posts: %s", len(posts))
+            if include_replies and posts and max_replies > 0:
+                replies = await self._collect_replies(
+                    context=context,
+                    posts=posts,
+                    max_replies=max_replies,
+                    reply_depth=reply_depth,
+                )
+                items.extend(replies)
+                logger.info("X replies collected: %s", len(replies))
+
+            return items
+        except Exception:
+            # cookies 可能已失效，下次使用该账号时重新校验登录
+            self._login_cache.pop(_login_cache_key(account), None)
+            raise
+        finally:
+            # 只关闭本次的 context（含 cookies），浏览器留给后续采集复用
+            await context.close()
+
+    async def _ensure_browser(self, async_playwright):
+        loop = asyncio.get_running_loop()
+        lock = self._browser_locks.get(loop)
+        if lock is None:
+            lock = self._browser_locks[loop] = asyncio.Lock()
+        async with lock:
+            browsers = self._browsers.setdefault(loop, {})
+            key = (self.headless, self.proxy)
+            entry = browsers.pop(key, None)
+            if entry is not None:
+                playwright, browser = entry
+                if browser.is_connected():
+                    browsers[key] = entry
+                    return browser
+                # 浏览器已崩溃或断开，释放后重新启动
+                await _stop_quietly(playwright, browser)
+
+            playwright = await async_playwright().start()
+            try:
+                browser = await playwright.chromium.launch(
+                    headless=self.headless,
+                    proxy=_build_proxy(self.proxy),
+                )
+            except Exception:
+                await playwright.stop()
+                raise
+            browsers[key] = (playwright, browser)
+            return browser
 
-                return items
-            finally:
-                await context.close()
-                await browser.close()
+    @classmethod
+    async def aclose_shared(cls) -> None:
+        loop = asyncio.get_running_loop()
+        cls._browser_locks.pop(loop, None)
+        for playwright, browser in (cls._browsers.pop(loop, None) or {}).values():
+            await _stop_quietly(playwright, browser)
 
     async def _is_logged_in(self, page) -> bool:
         if await page.locator('a[href="/login"]').count() > 0:
@@ -338,53 +484,69 @@ class XCollector(BaseCollector):
         max_replies: int,
         reply_depth: int,
     ) -> List[CollectedItem]:
-        replies: List[CollectedItem] = []
-        for post in posts:
-            if len(replies) >= max_replies:
-                break
-            logger.debug("X collecting replies for post=%s", post.source_id)
-            post_replies = await self._collect_replies_for_post(
+        # 整次回复抓取共用一个信号量，同时打开的回复页不超过 x_reply_concurrency
+        semaphore = asyncio.Semaphore(self.reply_concurrency)
+        replies = await self._gather_replies(
+            items=[post for post in posts if post.url],
+            limit=max_replies,
+            semaphore=semaphore,
+            collect=lambda post, remaining: self._collect_replies_from_url(
                 context=context,
-                post=post,
+                url=post.url,
+                parent_id=post.source_id,
+                limit=remaining,
+                depth=1,
+            ),
+        )
+        if reply_depth > 1 and len(replies) < max_replies:
+            # 一级回复全部抓完、页面关闭后再抓嵌套回复，避免占着槽位再嵌套并发
+            nested = await self._gather_replies(
+                items=[reply for reply in replies if reply.url],
                 limit=max_replies - len(replies),
-                reply_depth=reply_depth,
+                semaphore=semaphore,
+                collect=lambda reply, remaining: self._collect_replies_from_url(
+                    context=context,
+                    url=reply.url,
+                    parent_id=reply.source_id,
+                    limit=remaining,
+                    depth=2,
+                ),
             )
-            replies.extend(post_replies)
+            replies.extend(nested)
         return replies
 
-    async def _collect_replies_for_post(
+    async def _gather_replies(
         self,
-        context,
-        post: CollectedItem,
+        items: List[CollectedItem],
         limit: int,
-        reply_depth: int,
+        semaphore: asyncio.Semaphore,
+        collect: Callable[[CollectedItem, int], Awaitable[List[CollectedItem]]],
     ) -> List[CollectedItem]:
-        if not post.url or limit <= 0:
-            return []
-
-        page = await context.new_page()
-        page.set_default_timeout(self.timeout_ms)
-        try:
-            await page.goto(post.url, wait_until="domcontentloaded")
-            await page.wait_for_selector('article[data-testid="tweet"]', timeout=self.timeout_ms)
-
-            replies = await self._collect_replies_from_page(
-                page=page,
-                parent_id=post.source_id,
-                limit=limit,
-                depth=1,
-            )
-
-            if reply_depth > 1 and replies:
-                nested = await self._collect_nested_replies(
-                    context=context,
-                    replies=replies,
-                    limit=limit - len(replies),
-                )
-                replies.extend(nested)
-            return replies
-        finally:
-            await page.close()
+        """在 semaphore 限制下并发抓取各条目的回复页，结果按条目顺序拼接并截断到 limit
+
+        每个任务开始时按剩余额度抓取，额度用完后尚未开始的任务直接跳过。
+        """
+        collected = 0
+
+        async def run(item: CollectedItem) -> List[CollectedItem]:
+            nonlocal collected
+            async with semaphore:
+                remaining = limit - collected
+                if remaining <= 0:
+                    return []
+                logger.debug("X collecting replies for %s", item.source_id)
+                found = await collect(item, remaining)
+                collected += len(found)
+                return found
+
+        results = await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+        replies: List[CollectedItem] = []
+        for item, result in zip(items, results):
+            if isinstance(result, BaseException):
+                logger.warning("X replies failed for %s: %s", item.source_id, result)
+                continue
+            replies.extend(result)
+        return replies[:limit]
 
     async def _collect_replies_from_page(
         self,
@@ -424,35 +586,27 @@ class XCollector(BaseCollector):
 
         return items[:limit]
 
-    async def _collect_nested_replies(
+    async def _collect_replies_from_url(
         self,
         context,
-        replies: List[CollectedItem],
+        url: str,
+        parent_id: str,
         limit: int,
+        depth: int,
     ) -> List[CollectedItem]:
-        if limit <= 0:
-            return []
-        nested: List[CollectedItem] = []
-        for reply in replies:
-            if len(nested) >= limit:
-                break
-            if not reply.url:
-                continue
-            page = await context.new_page()
-            page.set_default_timeout(self.timeout_ms)
-            try:
-                await page.goto(reply.url, wait_until="domcontentloaded")
-                await page.wait_for_selector('article[data-testid="tweet"]', timeout=self.timeout_ms)
-                more = await self._collect_replies_from_page(
-                    page=page,
-                    parent_id=reply.source_id,
-                    limit=limit - len(nested),
-                    depth=2,
-                )
-                nested.extend(more)
-            finally:
-                await page.close()
-        return nested
+        page = await context.new_page()
+        page.set_default_timeout(self.timeout_ms)
+        try:
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector('article[data-testid="tweet"]', timeout=self.timeout_ms)
+            return await self._collect_replies_from_page(
+                page=page,
+                parent_id=parent_id,
+                limit=limit,
+                depth=depth,
+            )
+        finally:
+            await page.close()
 
     async def _extract_tweets_from_page(
         self,
@@ -463,11 +617,12 @@ class XCollector(BaseCollector):
         depth: int,
         exclude_ids: Optional[set[str]],
     ) -> List[CollectedItem]:
+        # 一次 evaluate 在浏览器内读出所有推文字段，避免逐元素逐字段的 IPC 往返
+        raw_tweets = await page.evaluate(_EXTRACT_TWEETS_JS)
         items: List[CollectedItem] = []
-        articles = await page.query_selector_all('article[data-testid="tweet"]')
-        for article in articles:
-            item = await self._parse_tweet_from_element(
-                article=article,
+        for raw in raw_tweets or ():
+            item = self._parse_tweet(
+                raw=raw,
                 content_type=content_type,
                 parent_id=parent_id,
                 depth=depth,
@@ -482,14 +637,14 @@ class XCollector(BaseCollector):
             items.append(item)
         return items
 
-    async def _parse_tweet_from_element(
+    def _parse_tweet(
         self,
-        article,
+        raw: Dict[str, Any],
         content_type: str,
         parent_id: Optional[str],
         depth: int,
     ) -> Optional[CollectedItem]:
-        url = await self._get_first_href(article, 'a[href*="/status/"]')
+        url = _strip_or_none(raw.get("url"))
         if not url:
             return None
         full_url = self._normalize_url(url)
@@ -497,19 +652,19 @@ class XCollector(BaseCollector):
         if not source_id:
             return None
 
-        text = await self._get_text(article, 'div[data-testid="tweetText"]')
+        text = _strip_or_none(raw.get("text"))
         content = self.clean_text(text) or text
         title = (content or "").strip()[:80] if content else None
 
-        author_name = await self._get_author_name(article)
-        author_handle = await self._get_author_handle(article)
-        published_at = self._parse_datetime(await self._get_attr(article, 'time', 'datetime'))
+        author_name = raw.get("author_name") or None
+        author_handle = self._parse_author_handle(raw.get("author_href"))
+        published_at = self._parse_datetime(_strip_or_none(raw.get("datetime")))
 
         metrics = {
-            "num_comments": await self._get_metric(article, "reply"),
-            "retweets": await self._get_metric(article, "retweet"),
-            "likes": await self._get_metric(article, "like"),
-            "views": await self._get_views(article),
+            "num_comments": self._parse_count(raw.get("reply")),
+            "retweets": self._parse_count(raw.get("retweet")),
+            "likes": self._parse_count(raw.get("like")),
+            "views": self._parse_count(raw.get("views")),
         }
 
         extra_fields: Dict[str, Any] = {}
@@ -534,32 +689,7 @@ class XCollector(BaseCollector):
             published_at=published_at,
         )
 
-    async def _get_text(self, element, selector: str) -> Optional[str]:
-        target = await element.query_selector(selector)
-        if not target:
-            return None
-        text = await target.inner_text()
-        return text.strip() if text else None
-
-    async def _get_attr(self, element, selector: str, attr: str) -> Optional[str]:
-        target = await element.query_selector(selector)
-        if not target:
-            return None
-        value = await target.get_attribute(attr)
-        return value.strip() if value else None
-
-    async def _get_first_href(self, element, selector: str) -> Optional[str]:
-        target = await element.query_selector(selector)
-        if not target:
-            return None
-        href = await target.get_attribute("href")
-        return href.strip() if href else None
-
-    async def _get_author_handle(self, article) -> Optional[str]:
-        user_link = await article.query_selector('div[data-testid="User-Name"] a')
-        if not user_link:
-            return None
-        href = await user_link.get_attribute("href")
+    def _parse_author_handle(self, href: Optional[str]) -> Optional[str]:
         if not href:
             return None
         handle = href.strip().lstrip("/")
@@ -567,46 +697,22 @@ class XCollector(BaseCollector):
             return handle
         return None
 
-    async def _get_author_name(self, article) -> Optional[str]:
-        name_container = await article.query_selector('div[data-testid="User-Name"]')
-        if not name_container:
-            return None
-        spans = await name_container.query_selector_all("span")
-        for span in spans:
-            text = (await span.inner_text()).strip()
-            if text and not text.startswith("@"):
-                return text
-        return None
-
-    async def _get_metric(self, article, testid: str) -> int:
-        metric = await article.query_selector(f'div[data-testid="{testid}"]')
-        if not metric:
-            return 0
-        label = await metric.get_attribute("aria-label")
-        text = label or (await metric.inner_text())
-        return self._parse_count(text)
-
-    async def _get_views(self, article) -> int:
-        view_el = await article.query_selector('a[href*="/analytics"]')
-        if not view_el:
-            view_el = await article.query_selector('div[data-testid="viewCount"]')
-        if not view_el:
-            return 0
-        label = await view_el.get_attribute("aria-label")
-        text = label or (await view_el.inner_text())
-        return self._parse_count(text)
-
     async def _scroll_page(self, page) -> None:
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await asyncio.sleep(random.uniform(0.7, 1.4))
+        height = await page.evaluate(_SCROLL_TO_BOTTOM_JS)
+        # 新推文加载后页面会变高；时间线会回收 DOM 节点，所以不按 article 数量判断
+        try:
+            await page.wait_for_function(
+                "h => document.body.scrollHeight > h",
+                arg=height,
+                timeout=SCROLL_WAIT_TIMEOUT_MS,
+            )
+        except Exception:
+            # 超时说明暂时没有新内容，交给调用方的 stagnant_rounds 处理
+            pass
+        await asyncio.sleep(random.uniform(0.15, 0.3))
 
     def _build_search_url(self, keyword: str, language: str, sort: str) -> str:
-        query = keyword.strip()
-        if language:
-            query = f"{query} lang:{language}"
-        encoded = quote_plus(query)
-        sort_key = "top" if sort.lower() in {"top", "relevance"} else "live"
-        return f"https://x.com/search?q={encoded}&src=typed_query&f={sort_key}"
+        return _build_search_url_cached(keyword, language, sort)
 
     def _normalize_url(self, url: str) -> str:
         if url.startswith("http"):
@@ -631,7 +737,7 @@ class XCollector(BaseCollector):
         if not text:
             return 0
         cleaned = text.replace(",", "").strip().lower()
-        match = re.search(r"([\d.]+)\s*([km]?)", cleaned)
+        match = _COUNT_RE.search(cleaned)
         if not match:
             return 0
         value = float(match.group(1))
@@ -643,6 +749,55 @@ class XCollector(BaseCollector):
         return int(value)
 
 
+async def _block_nonessential(route) -> None:
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+        marker in request.url for marker in _BLOCKED_URL_MARKERS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _strip_or_none(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return value.strip() or None
+
+
+async def _stop_quietly(playwright, browser) -> None:
+    try:
+        await browser.close()
+    except Exception as exc:
+        logger.debug("X browser close failed: %s", exc)
+    try:
+        await playwright.stop()
+    except Exception as exc:
+        logger.debug("Playwright stop failed: %s", exc)
+
+
+def _login_cache_key(account: XAccount) -> Tuple[str, str]:
+    """登录缓存键：账号 id + auth_token/ct0 的摘要；两者都缺失时对全部 cookie 取摘要"""
+    values = sorted(
+        f"{cookie.get('name')}={cookie.get('value')}"
+        for cookie in account.cookies
+        if cookie.get("name") in _LOGIN_COOKIE_NAMES
+    ) or sorted(f"{cookie.get('name')}={cookie.get('value')}" for cookie in account.cookies)
+    digest = hashlib.sha256("\n".join(values).encode("utf-8")).hexdigest()
+    return account.account_id, digest
+
+
+@lru_cache(maxsize=1024)
+def _build_search_url_cached(keyword: str, language: str, sort: str) -> str:
+    """订阅轮询的关键词基本固定，相同参数直接复用已编码的 URL"""
+    query = keyword.strip()
+    if language:
+        query = f"{query} lang:{language}"
+    encoded = quote_plus(query)
+    sort_key = "top" if sort.lower() in _SORT_KEYS else "live"
+    return f"https://x.com/search?q={encoded}&src=typed_query&f={sort_key}"
+
+
 def _build_proxy(proxy: Optional[str]) -> Optional[Dict[str, str]]:
     if not proxy:
         return None
@@ -653,15 +808,14 @@ def _parse_cookie_header(cookie_header: str, domain: str, path: str) -> List[Dic
     cookies: List[Dict[str, str]] = []
     if not cookie_header:
         return cookies
-    parts = [part.strip() for part in cookie_header.split(";") if part.strip()]
-    for part in parts:
-        if "=" not in part:
-            continue
-        name, value = part.split("=", 1)
+    for part in cookie_header.split(";"):
+        name, sep, value = part.partition("=")
         name = name.strip()
-        value = value.strip().strip('"')
-        if not name:
+        if not sep or not name:
             continue
+        value = value.strip()
+        if value[:1] == '"':
+            value = value.strip('"')
         cookies.append(
             {
                 "name": name,
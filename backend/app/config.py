@@ -9,6 +9,13 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str
+    # 留空时由 database_url 推导（postgresql+asyncpg）
+    async_database_url: str = ""
+    # 连接池（同步/异步引擎共用）
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
 
     # Redis
     redis_url: str
@@ -25,6 +32,16 @@ class Settings(BaseSettings):
     llm_api_key: str
     llm_api_base_url: str
     llm_model: str
+    # 为 system prompt 添加 cache_control（Anthropic 等需要显式标记前缀缓存的服务）
+    llm_prompt_cache_control: bool = False
+    # 单个分析任务内同时在途的 LLM 请求数上限
+    llm_max_concurrency: int = 4
+
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_use_redis: bool = True
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_max_entries: int = 512
 
     # API Auth
     api_key: str = ""
@@ -37,11 +54,15 @@ class Settings(BaseSettings):
     x_user_agent: str = ""
     x_timeout_ms: int = 30000
     x_account_error_limit: int = 3
+    x_reply_concurrency: int = 4
+    x_block_media: bool = True
+    x_login_ttl_s: int = 1800
 
     # App Config
     debug: bool
     log_level: str
     analysis_text_truncation_limit: int = 200
+    language_detection_model_path: str = ""
 
     # Scheduler
     scheduler_enabled: bool
@@ -53,6 +74,8 @@ class Settings(BaseSettings):
 
     # Semantic sampling (local embedding)
     semantic_sampling_model: str = "intfloat/multilingual-e5-small"
+    semantic_sampling_backend: str = "torch"
+    semantic_sampling_model_file: str = ""
     semantic_sampling_max_items: int = 200
     semantic_sampling_target_count: int = 50
     semantic_sampling_k_min: int = 3
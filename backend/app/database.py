@@ -1,27 +1,49 @@
 """数据库连接配置"""
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
+# 同步/异步引擎共用的连接池参数
+_POOL_OPTIONS = dict(
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
 )
 
+engine = create_engine(settings.database_url, **_POOL_OPTIONS)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _build_async_database_url() -> str:
+    """未单独配置时，由 DATABASE_URL 推导出 asyncpg 连接串"""
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(_build_async_database_url(), **_POOL_OPTIONS)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 
-def get_db():
-    """获取数据库会话的依赖注入函数"""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """获取数据库会话的依赖注入函数（API 使用 AsyncSession，Celery/调度器仍用 SessionLocal）"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
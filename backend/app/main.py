@@ -6,10 +6,11 @@ from logging.handlers import RotatingFileHandler
 
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
 from app.api import tasks, platforms, subscriptions, alerts
-from app.api.deps import require_api_key
+from app.api.deps import get_scheduler, require_api_key
 from app.database import SessionLocal
 from app.models import Subscription
 from app.services.scheduler_service import SchedulerService
@@ -118,6 +119,7 @@ app = FastAPI(
     redoc_url="/api/redoc",
     lifespan=lifespan,
     dependencies=[Depends(require_api_key)],
+    default_response_class=ORJSONResponse,
 )
 
 # CORS配置
@@ -132,9 +134,8 @@ app.add_middleware(
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(scheduler: SchedulerService = Depends(get_scheduler)):
     """健康检查接口"""
-    scheduler = SchedulerService.get_instance()
     jobs = scheduler.get_all_jobs()
     scheduler_status = scheduler.get_status()
 
@@ -150,9 +151,8 @@ async def health_check():
 
 
 @app.get("/scheduler/jobs")
-async def list_scheduler_jobs():
+async def list_scheduler_jobs(scheduler: SchedulerService = Depends(get_scheduler)):
     """列出所有调度任务（调试用）"""
-    scheduler = SchedulerService.get_instance()
     return {
         "jobs": scheduler.get_all_jobs()
     }
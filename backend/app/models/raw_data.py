@@ -3,7 +3,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Integer, DateTime, Enum, Text, JSON, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Integer, DateTime, Enum, Text, JSON, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -33,7 +33,7 @@ class RawData(Base):
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
 
     platform = Column(Enum(Platform), nullable=False, index=True)
     content_type = Column(Enum(ContentType), nullable=False)
@@ -51,3 +51,7 @@ class RawData(Base):
     crawled_at = Column(DateTime, default=datetime.utcnow)
 
     task = relationship("Task", back_populates="raw_data")
+
+
+# 原始数据按 task 内 id 顺序做游标分页；前缀列同时覆盖按 task_id 的查询
+Index("ix_raw_data_task_id_id", RawData.task_id, RawData.id)
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, String, Integer, DateTime, Enum, Text, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, Enum, Text, JSON, ForeignKey, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -24,7 +24,7 @@ class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    subscription_id = Column(UUID(as_uuid=True), ForeignKey("subscriptions.id"), nullable=True, index=True)
+    subscription_id = Column(UUID(as_uuid=True), ForeignKey("subscriptions.id"), nullable=True)
     keyword = Column(String(255), nullable=False, index=True)
     language = Column(String(10), default="en")
     report_language = Column(String(10), default="auto")
@@ -44,3 +44,14 @@ class Task(Base):
     raw_data = relationship("RawData", back_populates="task", cascade="all, delete-orphan")
     analysis_result = relationship("AnalysisResult", back_populates="task", uselist=False, cascade="all, delete-orphan")
     subscription = relationship("Subscription", back_populates="tasks")
+
+
+Index(
+    "ix_tasks_subscription_id_created",
+    Task.subscription_id,
+    Task.created_at.desc(),
+    postgresql_include=["status"],
+)
+
+# 任务列表按 (created_at, id) 倒序做游标分页
+Index("ix_tasks_created_at_id", Task.created_at.desc(), Task.id.desc())
@@ -1,9 +1,19 @@
 """订阅相关的请求/响应模型"""
+import math
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+def resolve_intervals(interval_hours: Optional[int], interval_minutes: Optional[int]) -> Tuple[int, Optional[int]]:
+    """归一化执行间隔：分钟优先，小时向上取整且至少为 1"""
+    if interval_minutes is not None:
+        interval_minutes = max(1, int(interval_minutes))
+        return max(1, math.ceil(interval_minutes / 60)), interval_minutes
+    interval_hours = int(interval_hours) if interval_hours is not None else 6
+    return max(1, interval_hours), None
 
 
 class SubscriptionCreate(BaseModel):
@@ -22,6 +32,11 @@ class SubscriptionCreate(BaseModel):
     alert_threshold: int = Field(default=30, ge=0, le=100)
     platform_configs: Optional[Dict[str, Any]] = None
 
+    @model_validator(mode="after")
+    def _normalize_intervals(self) -> "SubscriptionCreate":
+        self.interval_hours, self.interval_minutes = resolve_intervals(self.interval_hours, self.interval_minutes)
+        return self
+
 
 class SubscriptionUpdate(BaseModel):
     """更新订阅请求"""
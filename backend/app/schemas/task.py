@@ -80,6 +80,8 @@ class RawDataListResponse(BaseModel):
     page: int
     page_size: int
     data: List[RawDataResponse]
+    # 游标分页：传给下一次请求的 cursor 参数，没有更多数据时为 None
+    next_cursor: Optional[str] = None
 
 
 class TaskSummaryResponse(BaseModel):
@@ -104,3 +106,5 @@ class TaskListResponse(BaseModel):
     page: int
     page_size: int
     data: List[TaskSummaryResponse]
+    # 游标分页：传给下一次请求的 cursor 参数，没有更多数据时为 None
+    next_cursor: Optional[str] = None
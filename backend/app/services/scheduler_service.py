@@ -1,7 +1,7 @@
 """APScheduler 调度服务"""
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
@@ -249,6 +249,32 @@ class SchedulerService:
         except Exception as e:
             logger.warning(f"Failed to remove job {job_id}: {e}")
 
+    def reconcile_subscription_job(
+        self,
+        subscription_id: str,
+        *,
+        interval_hours: int,
+        interval_minutes: Optional[int],
+        is_active: bool,
+        interval_changed: bool,
+        active_changed: bool,
+    ) -> Optional[dict]:
+        """
+        按订阅变更一次性同步调度任务，返回最新任务信息（已暂停时返回 None）
+
+        reschedule_job 会重新计算 next_run_time（相当于恢复任务），
+        因此间隔变更后只对停用的订阅补一次 pause，不再重复 pause/resume。
+        """
+        if interval_changed:
+            self.update_subscription_job(subscription_id, interval_hours, interval_minutes=interval_minutes)
+        if not is_active:
+            if interval_changed or active_changed:
+                self.pause_subscription_job(subscription_id)
+            return None
+        if active_changed:
+            self.resume_subscription_job(subscription_id)
+        return self.get_job_info(subscription_id)
+
     def get_job_info(self, subscription_id: str) -> Optional[dict]:
         """获取任务信息"""
         if not self._scheduler:
@@ -265,6 +291,24 @@ class SchedulerService:
             }
         return None
 
+    def get_jobs_info_bulk(self, subscription_ids: Iterable[str]) -> Dict[str, dict]:
+        """一次 get_jobs() 批量获取任务信息，返回 subscription_id -> 任务信息"""
+        if not self._scheduler:
+            return {}
+
+        wanted = {f"subscription_{subscription_id}": subscription_id for subscription_id in subscription_ids}
+        if not wanted:
+            return {}
+        return {
+            wanted[job.id]: {
+                "job_id": job.id,
+                "next_run_time": job.next_run_time,
+                "trigger": str(job.trigger),
+            }
+            for job in self._scheduler.get_jobs()
+            if job.id in wanted
+        }
+
     def get_all_jobs(self) -> list:
         """获取所有任务"""
         if not self._scheduler:
@@ -306,7 +350,7 @@ def trigger_subscription_task(subscription_id: str):
     只负责：查询订阅 → 创建任务记录 → 投递给 Celery
     耗时的采集和分析工作由 Celery Worker 执行
     """
-    from uuid import UUID
+    from uuid import UUID, uuid4
     from app.database import SessionLocal
     from app.models import Subscription, Task, TaskStatus
     from app.workers.collect_tasks import collect_and_analyze
@@ -334,8 +378,10 @@ def trigger_subscription_task(subscription_id: str):
             logger.info(f"Subscription is inactive: {subscription_id}")
             return
 
-        # 创建任务记录
+        # 创建任务记录，Celery task id 预先生成，和订阅状态一起一次提交
+        celery_task_id = str(uuid4())
         task = Task(
+            id=uuid4(),
             subscription_id=subscription.id,
             keyword=subscription.keyword,
             language=subscription.language,
@@ -345,18 +391,9 @@ def trigger_subscription_task(subscription_id: str):
             platforms=subscription.platforms,
             platform_configs=subscription.platform_configs or {},
             status=TaskStatus.PENDING,
+            celery_task_id=celery_task_id,
         )
         db.add(task)
-        db.commit()
-        db.refresh(task)
-
-        logger.info(f"Created task {task.id} for subscription {subscription_id}")
-
-        # 投递给 Celery Worker（立即返回，不阻塞）
-        celery_task = collect_and_analyze.delay(str(task.id))
-
-        # 更新任务的 Celery Task ID
-        task.celery_task_id = celery_task.id
 
         # 更新订阅的最后执行时间
         subscription.last_run_at = datetime.utcnow()
@@ -365,7 +402,12 @@ def trigger_subscription_task(subscription_id: str):
 
         db.commit()
 
-        logger.info(f"Dispatched Celery task {celery_task.id} for task {task.id}")
+        logger.info(f"Created task {task.id} for subscription {subscription_id}")
+
+        # 提交后再投递给 Celery Worker（立即返回，不阻塞）
+        collect_and_analyze.apply_async(args=[str(task.id)], task_id=celery_task_id)
+
+        logger.info(f"Dispatched Celery task {celery_task_id} for task {task.id}")
 
     except Exception as e:
         logger.error(f"Error triggering subscription task {subscription_id}: {e}")
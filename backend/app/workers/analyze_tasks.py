@@ -1,11 +1,14 @@
 """AI分析任务"""
 import asyncio
 import heapq
+import logging
 import math
+import threading
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 
 from celery import shared_task
+from celery.signals import worker_process_shutdown, worker_shutdown
 
 from app.database import SessionLocal
 from app.models import Task, TaskStatus, RawData, AnalysisResult, Alert
@@ -17,8 +20,39 @@ from app.analyzers import (
     MermaidGenerator,
 )
 from app.analyzers.embedding_sampler import EmbeddingSampler
+from app.analyzers.llm_client import get_llm_client
+from app.analyzers.llm_validators import validate_mermaid_output
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
+# 分析用的事件循环按 worker 线程常驻，LLM 客户端的 keep-alive 连接池绑定在 loop 上，才能跨任务复用
+_analysis_loop_state = threading.local()
+
+
+def _get_analysis_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_analysis_loop_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _analysis_loop_state.loop = loop
+    return loop
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_analysis_loop(**kwargs) -> None:
+    """worker 退出时关闭 LLM 连接池和常驻 loop"""
+    loop = getattr(_analysis_loop_state, "loop", None)
+    if loop is None or loop.is_closed():
+        return
+    try:
+        loop.run_until_complete(get_llm_client().aclose())
+    except Exception as exc:
+        logger.warning("Failed to close LLM client: %s", exc)
+    finally:
+        loop.close()
+        _analysis_loop_state.loop = None
+
 
 @shared_task(bind=True, max_retries=2)
 def analyze_task(self, task_id: str):
@@ -107,20 +141,16 @@ def analyze_task(self, task_id: str):
             db.commit()
             return {"error": "No valid data"}
 
-        loop = asyncio.new_event_loop()
+        loop = _get_analysis_loop()
         asyncio.set_event_loop(loop)
-
-        try:
-            result = loop.run_until_complete(
-                _run_analysis(
-                    task.keyword,
-                    items,
-                    task.report_language or "auto",
-                    task.semantic_sampling,
-                )
+        result = loop.run_until_complete(
+            _run_analysis(
+                task.keyword,
+                items,
+                task.report_language or "auto",
+                task.semantic_sampling,
             )
-        finally:
-            loop.close()
+        )
 
         platform_distribution = {
             p: round(c / total * 100) for p, c in platform_counts.items()
@@ -196,6 +226,8 @@ async def _run_analysis(
         )
         sampler = EmbeddingSampler(
             model_name=settings.semantic_sampling_model,
+            backend=settings.semantic_sampling_backend,
+            model_file=settings.semantic_sampling_model_file,
             max_items=settings.semantic_sampling_max_items,
             target_count=settings.semantic_sampling_target_count,
             k_min=settings.semantic_sampling_k_min,
@@ -219,7 +251,7 @@ async def _run_analysis(
 
     clustering_analyzer = ClusteringAnalyzer()
     trunc_len = settings.analysis_text_truncation_limit
-    items_text = [(item.content or item.title or "")[:trunc_len] for item in top_items]
+    items_text = [item.display_text[:trunc_len] for item in top_items]
     clustering_result = await clustering_analyzer.analyze(
         sentiment_results,
         items_text,
@@ -229,6 +261,14 @@ async def _run_analysis(
 
     mermaid_generator = MermaidGenerator()
     mermaid_code = await mermaid_generator.generate(keyword, clustering_result["key_opinions"], sentiment_score)
+    # 入库前确保可渲染，查询接口直接读取
+    valid, _ = validate_mermaid_output(mermaid_code)
+    if not valid:
+        mermaid_code = mermaid_generator.build_safe_mindmap(
+            keyword,
+            clustering_result["key_opinions"],
+            sentiment_score,
+        )
 
     return {
         "sentiment_score": sentiment_score,
@@ -310,7 +350,7 @@ def _calculate_heat_index(
     half_life_hours = 24.0
     decay_lambda = math.log(2) / half_life_hours
     for item in items:
-        metrics = item.metrics or {}
+        metrics = item.get_metrics()
         upvotes = metrics.get("upvotes", 0)
         likes = metrics.get("likes", 0)
         views = metrics.get("views", 0)
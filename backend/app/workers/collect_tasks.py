@@ -1,12 +1,14 @@
 """采集任务"""
 import asyncio
 import logging
+import threading
 import time
 from typing import List
 from uuid import UUID
 
 from celery import shared_task, chord
 from celery.exceptions import CeleryError
+from celery.signals import worker_process_shutdown, worker_shutdown
 from kombu.exceptions import OperationalError
 from sqlalchemy.orm import Session
 
@@ -17,6 +19,36 @@ from app.collectors.base import CollectedItem
 
 logger = logging.getLogger(__name__)
 
+# 采集用的事件循环按 worker 线程常驻，Reddit 连接池、X 浏览器等按 loop 缓存的资源才能跨任务复用
+_collect_loop_state = threading.local()
+
+
+def _get_collect_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_collect_loop_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _collect_loop_state.loop = loop
+    return loop
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_collect_loop(**kwargs) -> None:
+    """worker 退出时释放各采集器的共享资源并关闭常驻 loop"""
+    loop = getattr(_collect_loop_state, "loop", None)
+    if loop is None or loop.is_closed():
+        return
+    try:
+        for platform in CollectorRegistry.list_platforms():
+            try:
+                loop.run_until_complete(CollectorRegistry.get(platform).aclose_shared())
+            except Exception as exc:
+                logger.warning("Failed to release shared resources for %s: %s", platform, exc)
+    finally:
+        loop.close()
+        _collect_loop_state.loop = None
+
+
 @shared_task(bind=True, max_retries=3)
 def collect_and_analyze(self, task_id: str):
     """采集并分析任务"""
@@ -108,6 +140,9 @@ async def _collect_single_platform(
             "x_user_agent": settings.x_user_agent,
             "x_timeout_ms": settings.x_timeout_ms,
             "x_account_error_limit": settings.x_account_error_limit,
+            "x_reply_concurrency": settings.x_reply_concurrency,
+            "x_block_media": settings.x_block_media,
+            "x_login_ttl_s": settings.x_login_ttl_s,
             "platform_config": platform_config,
         }
     )
@@ -130,20 +165,17 @@ def _collect_single_platform_sync(
     platform: str,
     platform_config: dict,
 ) -> List[CollectedItem]:
-    loop = asyncio.new_event_loop()
+    loop = _get_collect_loop()
     asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(
-            _collect_single_platform(
-                keyword=keyword,
-                limit=limit,
-                language=language,
-                platform=platform,
-                platform_config=platform_config,
-            )
+    return loop.run_until_complete(
+        _collect_single_platform(
+            keyword=keyword,
+            limit=limit,
+            language=language,
+            platform=platform,
+            platform_config=platform_config,
         )
-    finally:
-        loop.close()
+    )
 
 
 @shared_task(bind=True, max_retries=2)
@@ -265,8 +297,8 @@ def _save_raw_data(db: Session, task_id: str, items: List[CollectedItem]):
             content=item.content,
             author=item.author,
             url=item.url,
-            metrics=item.metrics,
-            extra_fields=item.extra_fields,
+            metrics=item.metrics or {},
+            extra_fields=item.extra_fields or {},
             published_at=item.published_at,
         )
         db.add(raw_data)
@@ -39,5 +39,40 @@ async def main() -> int:
     return 0
 
 
+def test_chat_follower_survives_leader_cancel() -> None:
+    """合并请求的发起者被取消时，跟随者应自行重试拿到结果，而不是一起被取消"""
+
+    class _Completions:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        async def create(self, **payload):
+            self.calls += 1
+            if self.calls == 1:
+                await asyncio.sleep(3600)
+            message = type("Message", (), {"content": "pong"})()
+            return type("Response", (), {"choices": [type("Choice", (), {"message": message})()]})()
+
+    completions = _Completions()
+    fake_client = type("Client", (), {"chat": type("Chat", (), {"completions": completions})()})()
+    client = LLMClient()
+    client.prompt_cache_control = False
+    client._get_client = lambda: fake_client
+    messages = [{"role": "user", "content": "ping"}]
+
+    async def run() -> str:
+        leader = asyncio.create_task(client.chat(messages))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(client.chat(messages))
+        await asyncio.sleep(0)
+        leader.cancel()
+        reply = await asyncio.wait_for(follower, timeout=5)
+        assert leader.cancelled()
+        return reply
+
+    assert asyncio.run(run()) == "pong"
+    assert completions.calls == 2
+
+
 if __name__ == "__main__":
     raise SystemExit(asyncio.run(main()))